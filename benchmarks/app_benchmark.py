@@ -0,0 +1,365 @@
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import random
+import resource
+import statistics
+import string
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# End-to-end benchmark of the five Streamlit apps. Each app is driven headlessly through
+# Streamlit's AppTest harness with scripted interactions on synthetic data of increasing
+# size. Every app and size runs in a fresh process, which records:
+#
+#   - cold start: the first run of the script, including its imports
+#   - the wall time of every scripted rerun, plus one idle rerun with no input changes,
+#     which catches work repeated on every rerun (store reloads, file reparses)
+#   - peak RSS of the process
+#   - the hottest functions over the reruns, by own time
+#
+# Rerun times include AppTest compiling the script on every run, which a real server
+# caches; it is the same for the baseline, so comparisons are unaffected.
+#
+# Results are compared against a stored baseline; the exit status is 1 on a regression.
+#
+#   python benchmarks/app_benchmark.py
+#   python benchmarks/app_benchmark.py --apps data_sweeper secure_data --sizes 1000 100000
+#   python benchmarks/app_benchmark.py --save-baseline
+#   python benchmarks/app_benchmark.py --output results.json --profile-dir profiles
+
+APPS = {
+    "convertor": "convertor.py",
+    "data_sweeper": "data_sweeper.py",
+    "growth_mindset": "growth_mindset.py",
+    "password_strength": "password-strength-meter.py",
+    "secure_data": "secure-data.py",
+}
+DEFAULT_SIZES = [1_000, 10_000]
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "app_baseline.json")
+TOLERANCE = 0.5  # allowed slowdown or growth over the baseline; single-CPU runs vary by ~30%
+NOISE_FLOOR = {"ms": 50.0, "mb": 10.0}  # differences below these are never regressions
+REPEAT = 3  # fresh processes per app and size; each metric is the median over them
+JOURNAL_NAME = "bench"
+JOURNAL_PASSPHRASE = "bench passphrase"  # with JOURNAL_NAME, opens the seeded journal
+HOT_FUNCTIONS = 15
+# Blocking calls where background threads sit idle; left out of the hot functions
+WAIT_FUNCTIONS = {
+    "<method 'acquire' of '_thread.lock' objects>",
+    "<method 'acquire' of '_thread.RLock' objects>",
+    "<method 'get' of '_queue.SimpleQueue' objects>",
+    "<method 'poll' of 'select.poll' objects>",
+    "<method 'poll' of 'select.epoll' objects>",
+    "<built-in method time.sleep>",
+}
+APP_TIMEOUT = 600  # seconds per script run
+
+# Synthetic data
+
+def make_csv(rows):
+    rng = random.Random(0)
+    lines = ["id,category,value,temperature"]
+    for i in range(rows):
+        value = "" if i % 50 == 0 else f"{rng.uniform(0, 1000):.2f}"
+        lines.append(f"{i % (rows // 2 or 1)},{rng.choice('abcde')},{value},{rng.uniform(-40, 45):.1f}")
+    return ("\n".join(lines) + "\n").encode()
+
+def make_passwords(count):
+    rng = random.Random(0)
+    alphabet = string.ascii_letters + string.digits + "!@#$%"
+    return ("\n".join("".join(rng.choices(alphabet, k=rng.randint(6, 16))) for _ in range(count)) + "\n").encode()
+
+def make_batch_records(count):
+    return "data,passkey\n" + "\n".join(f"record {i} {'x' * (i % 40)},bench{i % 3}" for i in range(count))
+
+# Function to fill the journal with `count` entries for the benchmark user, spread over past months
+def make_journal(count):
+    from core.growth_mindset import JOURNAL_FILE, Journal, journal_key
+    rng = random.Random(0)
+    words = "learn practice feedback deadline team project mistake progress habit focus mentor goal".split()
+    user = journal_key(JOURNAL_NAME, JOURNAL_PASSPHRASE)
+    journal = Journal(JOURNAL_FILE)
+    with journal.conn:
+        now = time.time()
+        for i in range(count):
+            created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now - i * 86400 / 4))
+            text = " ".join(rng.choices(words, k=12))
+            journal.conn.execute(
+                "INSERT INTO entries (user, created_at, month, challenge, reflection, achievement) VALUES (?, ?, ?, ?, ?, ?)",
+                (user, created_at, created_at[:7], "", text, ""),
+            )
+            journal.conn.executemany(
+                "INSERT OR IGNORE INTO postings (user, term, entry_id) VALUES (?, ?, ?)",
+                ((user, term, i + 1) for term in set(text.split())),
+            )
+    journal.close()
+
+# Scripted interactions. Each scenario gets the AppTest, the dataset size and `step`,
+# which times one action that reruns the script.
+
+def by_label(widgets, prefix):
+    return next(widget for widget in widgets if widget.label.startswith(prefix))
+
+def convertor_scenario(at, size, step):
+    step("select category", lambda: at.sidebar.selectbox[0].select("Temperature").run())
+    at.selectbox[0].select("Celsius")
+    at.selectbox[1].select("Fahrenheit")
+    at.number_input[0].set_value(100.0)
+    step("convert", lambda: at.button[0].click().run())
+    step("switch to upload", lambda: at.radio[0].set_value("Upload CSV").run())
+    step("upload csv", lambda: at.get("file_uploader")[0].upload("values.csv", make_csv(size), "text/csv").run())
+
+def data_sweeper_scenario(at, size, step):
+    step("upload", lambda: at.get("file_uploader")[0].upload("data.csv", make_csv(size), "text/csv").run())
+    step("open cleaning", lambda: by_label(at.checkbox, "Clean Data").check().run())
+    step("remove duplicates", lambda: by_label(at.button, "Remove Duplicates").click().run())
+    step("show chart", lambda: by_label(at.checkbox, "Show Visualization").check().run())
+
+def growth_mindset_scenario(at, size, step):
+    at.text_input[2].input(JOURNAL_NAME)
+    step("open journal", lambda: at.text_input[3].input(JOURNAL_PASSPHRASE).run())
+    at.text_input[0].input("a tight deadline")
+    at.text_area[0].input("asked my mentor for feedback early")
+    step("save entry", lambda: by_label(at.button, "Save to Journal").click().run())
+    step("search", lambda: by_label(at.text_input, "Search your journal").input("mentor feed").run())
+
+def password_strength_scenario(at, size, step):
+    step("type password", lambda: at.text_input[0].input("qwertyAbc123!").run())
+    step("check", lambda: by_label(at.button, "Check Password Strength").click().run())
+    step("upload list", lambda: at.get("file_uploader")[0].upload("passwords.txt", make_passwords(size), "text/plain").run())
+    step("audit", lambda: by_label(at.button, "Run Audit").click().run())
+
+def secure_data_scenario(at, size, step):
+    step("open store", lambda: at.sidebar.selectbox[0].select("Store Data").run())
+    at.text_area[0].input("benchmark secret")
+    at.text_input[0].input("bench-passkey")
+    at.text_input[1].input("bench-passkey")
+    at.checkbox[0].check()
+    step("encrypt", lambda: at.button[0].click().run())
+    token = at.code[0].value
+    step("open retrieve", lambda: at.sidebar.selectbox[0].select("Retrieve Data").run())
+    at.text_area[0].input(token)
+    at.text_input[0].input("bench-passkey")
+    step("decrypt", lambda: at.button[0].click().run())
+    step("open batch", lambda: at.sidebar.selectbox[0].select("Batch").run())
+    at.text_area[0].input(make_batch_records(size))
+    step("batch encrypt", lambda: at.button[0].click().run())
+
+SCENARIOS = {
+    "convertor": convertor_scenario,
+    "data_sweeper": data_sweeper_scenario,
+    "growth_mindset": growth_mindset_scenario,
+    "password_strength": password_strength_scenario,
+    "secure_data": secure_data_scenario,
+}
+SETUP = {"growth_mindset": make_journal}
+
+# Profiling. AppTest runs the script on a thread of its own; before Python 3.12 cProfile
+# only follows the thread that enables it, so a profiler is started in every new thread.
+
+def start_profiling(profiles):
+    if sys.version_info >= (3, 12):
+        profile = cProfile.Profile()
+        profile.enable()
+        profiles.append(profile)
+        return
+
+    def start_in_thread(frame, event, arg):
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        profiles.append(profile)
+        profile.enable()
+    threading.setprofile(start_in_thread)
+
+def stop_profiling(profiles):
+    threading.setprofile(None)
+    stats = None
+    for profile in profiles:
+        profile.disable()
+        stats = pstats.Stats(profile) if stats is None else stats.add(profile)
+    return stats
+
+# Function to name a profiled function by its path inside the repo, site-packages or stdlib
+def function_name(key):
+    path, line, name = key
+    stdlib = sysconfig.get_paths()["stdlib"]
+    if path.startswith(ROOT):
+        path = os.path.relpath(path, ROOT)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(stdlib):
+        path = os.path.relpath(path, stdlib)
+    return f"{path}:{line}({name})"
+
+def hot_functions(stats, count=HOT_FUNCTIONS):
+    rows = [item for item in stats.stats.items() if item[0][2] not in WAIT_FUNCTIONS]
+    rows = sorted(rows, key=lambda item: item[1][2], reverse=True)[:count]
+    return [
+        {"function": function_name(key), "calls": calls, "own_ms": round(own * 1000, 1), "cumulative_ms": round(cumulative * 1000, 1)}
+        for key, (_, calls, own, cumulative, _) in rows
+    ]
+
+# Function to run one app at one size in this process; returns its measurements
+def run_app(app, size, profile_path=None):
+    from streamlit.testing.v1 import AppTest
+
+    if app in SETUP:
+        SETUP[app](size)
+
+    def check(at, label):
+        if at.exception:
+            raise RuntimeError(f"{app} raised during {label}: {at.exception[0].message}")
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, APPS[app]), default_timeout=APP_TIMEOUT).run()
+    cold_start_ms = (time.perf_counter() - start) * 1000
+    check(at, "cold start")
+
+    profiles = []
+    start_profiling(profiles)
+    steps = {}
+
+    def step(label, action):
+        start = time.perf_counter()
+        action()
+        steps[label] = round((time.perf_counter() - start) * 1000, 1)
+        check(at, label)
+
+    SCENARIOS[app](at, size, step)
+    step("idle rerun", at.run)
+    stats = stop_profiling(profiles)
+    if profile_path and stats is not None:
+        stats.dump_stats(profile_path)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / 1024 / 1024 if sys.platform == "darwin" else peak_rss / 1024  # bytes on macOS, KB on Linux
+    return {
+        "cold_start_ms": round(cold_start_ms, 1),
+        "steps": steps,
+        "rerun_median_ms": round(statistics.median(steps.values()), 1),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "hot_functions": hot_functions(stats) if stats is not None else [],
+    }
+
+# Function to run one app at one size in a fresh process with a scratch working directory
+def run_isolated(app, size, profile_dir=None):
+    with tempfile.TemporaryDirectory() as workdir:
+        output = os.path.join(workdir, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--child", app, str(size), output]
+        if profile_dir:
+            command += ["--profile-dir", os.path.abspath(profile_dir)]
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        completed = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{app} at size {size} failed:\n{completed.stderr[-2000:]}")
+        with open(output) as f:
+            return json.load(f)
+
+# Function to combine repeated runs: the median of every timing and of peak RSS.
+# Hot functions are taken from the first run.
+def median_result(runs):
+    steps = {label: round(statistics.median(run["steps"][label] for run in runs), 1) for label in runs[0]["steps"]}
+    return {
+        "cold_start_ms": round(statistics.median(run["cold_start_ms"] for run in runs), 1),
+        "steps": steps,
+        "rerun_median_ms": round(statistics.median(steps.values()), 1),
+        "peak_rss_mb": round(statistics.median(run["peak_rss_mb"] for run in runs), 1),
+        "hot_functions": runs[0]["hot_functions"],
+    }
+
+# Function to flatten a result into the metrics compared with the baseline
+def comparable_metrics(result):
+    metrics = {"cold_start_ms": result["cold_start_ms"], "peak_rss_mb": result["peak_rss_mb"]}
+    metrics.update({f"{label} ms": value for label, value in result["steps"].items()})
+    return metrics
+
+# Function to compare results with the baseline; prints a table and returns the regressions
+def compare(results, baseline, tolerance):
+    regressions = []
+    print(f"\n{'app/size':<24} {'metric':<22} {'baseline':>10} {'current':>10} {'change':>8}")
+    for key, result in results.items():
+        base_metrics = comparable_metrics(baseline[key]) if key in baseline else {}
+        for metric, current in comparable_metrics(result).items():
+            base = base_metrics.get(metric)
+            if base is None:
+                print(f"{key:<24} {metric:<22} {'-':>10} {current:>10.1f} {'new':>8}")
+                continue
+            change = (current - base) / base if base else 0.0
+            floor = NOISE_FLOOR["mb" if metric.endswith("_mb") else "ms"]
+            regressed = change > tolerance and current - base > floor
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{key:<24} {metric:<22} {base:>10.1f} {current:>10.1f} {change:>+8.0%}{flag}")
+            if regressed:
+                regressions.append((key, metric))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rerun latency and memory of the Streamlit apps.")
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="rows, records or passwords of synthetic data")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="fresh processes per app and size")
+    parser.add_argument("--output", help="write the full results, with hot functions, to this JSON file")
+    parser.add_argument("--profile-dir", help="write a cProfile dump per app and size here")
+    parser.add_argument("--child", nargs=3, metavar=("APP", "SIZE", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        app, size, output = args.child
+        profile_path = os.path.join(args.profile_dir, f"{app}_{size}.prof") if args.profile_dir else None
+        result = run_app(app, int(size), profile_path)
+        with open(output, "w") as f:
+            json.dump(result, f)
+        return
+
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+    results = {}
+    for app in args.apps:
+        for size in args.sizes:
+            result = median_result([run_isolated(app, size, args.profile_dir) for _ in range(args.repeat)])
+            results[f"{app}/{size}"] = result
+            hottest = result["hot_functions"][0]
+            print(f"{app}/{size}: cold start {result['cold_start_ms']:.0f} ms, median rerun {result['rerun_median_ms']:.0f} ms, "
+                  f"peak RSS {result['peak_rss_mb']:.0f} MB, hottest {hottest['function']} ({hottest['own_ms']:.0f} ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": results}, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+        baseline.update({key: {name: value for name, value in result.items() if name != "hot_functions"} for key, result in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(), "results": baseline}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.breach_corpus import BreachCorpus, build_corpus_index
+
+# Build and lookup benchmark for the breached-password index of password-strength-meter.py,
+# against a Python set of the same passwords.
+#
+#   python benchmarks/breach_benchmark.py
+#   python benchmarks/breach_benchmark.py --entries 10000000 --lookups 1000000
+
+# Function to generate random passwords, one per line, into a corpus file
+def write_corpus(path, entries):
+    alphabet = string.ascii_letters + string.digits
+    passwords = []
+    with open(path, "w") as f:
+        for _ in range(entries):
+            password = "".join(random.choices(alphabet, k=random.randint(6, 14)))
+            passwords.append(password)
+            f.write(password + "\n")
+    return passwords
+
+# Function to time lookups; returns microseconds per lookup and the number of hits
+def lookup_latency(container, passwords):
+    start = time.perf_counter()
+    hits = sum(1 for password in passwords if password in container)
+    return (time.perf_counter() - start) / len(passwords) * 1e6, hits
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the breached-password index.")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "corpus.txt")
+        index = os.path.join(tmp, "corpus.idx")
+        passwords = write_corpus(source, args.entries)
+
+        start = time.perf_counter()
+        count = build_corpus_index(source, index)
+        print(f"build: {count:,} entries in {time.perf_counter() - start:.1f}s, index {os.path.getsize(index) / 1024 / 1024:.1f} MB")
+
+        present = random.sample(passwords, min(args.lookups, len(passwords)))
+        absent = ["!" + password for password in present]
+
+        # Memory is measured on a separate run, since tracing slows every lookup down
+        tracemalloc.start()
+        corpus = BreachCorpus(index)
+        lookup_latency(corpus, present[:1000])
+        heap = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        hit_us, hits = lookup_latency(corpus, present)
+        miss_us, false_hits = lookup_latency(corpus, absent)
+        print(f"index: {hit_us:.2f} us/hit, {miss_us:.2f} us/miss, {hits:,}/{len(present):,} found, "
+              f"{false_hits} false positives, peak Python heap {heap / 1024:.0f} KB")
+
+        tracemalloc.start()
+        deny_set = set(passwords)
+        heap = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        hit_us, _ = lookup_latency(deny_set, present)
+        miss_us, _ = lookup_latency(deny_set, absent)
+        print(f"set:   {hit_us:.2f} us/hit, {miss_us:.2f} us/miss, Python heap {heap / 1024 / 1024:.1f} MB per process")
+        corpus.close()
+
+if __name__ == "__main__":
+    main()
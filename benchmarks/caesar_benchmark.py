@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.secure_data_fallback import caesar_encrypt
+
+# Throughput benchmark for the secure-data.py Caesar fallback:
+# the translation-table engine against the original character-by-character loop.
+#
+#   python benchmarks/caesar_benchmark.py
+#   python benchmarks/caesar_benchmark.py --sizes 1K 1M 100M --legacy-max 10M
+
+UNITS = {"K": 1024, "M": 1024 * 1024}
+
+# Original implementation, kept here as the baseline
+def legacy_caesar_encrypt(text, shift):
+    result = ""
+    for char in text:
+        if char.isalpha():
+            ascii_offset = ord('a') if char.islower() else ord('A')
+            result += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
+        else:
+            result += char
+    return result
+
+# Function to parse sizes like "64K" or "100M"
+def parse_size(text):
+    unit = text[-1].upper()
+    return int(text[:-1]) * UNITS[unit] if unit in UNITS else int(text)
+
+# Function to time one call and return throughput in MB/s
+def throughput(func, data, shift=7):
+    start = time.perf_counter()
+    func(data, shift)
+    elapsed = time.perf_counter() - start
+    return len(data) / (1024 * 1024) / max(elapsed, 1e-9)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Caesar fallback cipher.")
+    parser.add_argument("--sizes", nargs="+", default=["1K", "64K", "1M", "10M", "100M"])
+    parser.add_argument("--legacy-max", default="10M", help="skip the legacy loop above this size")
+    args = parser.parse_args()
+
+    legacy_max = parse_size(args.legacy_max)
+    sample = (string.ascii_letters + string.digits + " .,\n").encode()
+
+    print(f"{'size':>8} {'legacy MB/s':>12} {'table str MB/s':>15} {'table bytes MB/s':>17} {'speedup':>8}")
+    for label in args.sizes:
+        size = parse_size(label)
+        data_bytes = bytes(random.choices(sample, k=size))
+        data_text = data_bytes.decode()
+
+        table_str = throughput(caesar_encrypt, data_text)
+        table_bytes = throughput(caesar_encrypt, data_bytes)
+        if size <= legacy_max:
+            legacy = throughput(legacy_caesar_encrypt, data_text)
+            print(f"{label:>8} {legacy:>12.1f} {table_str:>15.1f} {table_bytes:>17.1f} {table_str / legacy:>7.0f}x")
+        else:
+            print(f"{label:>8} {'skipped':>12} {table_str:>15.1f} {table_bytes:>17.1f} {'-':>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.convertor import convert
+
+# Throughput benchmark for convertor.py: the vectorized engine against the original
+# per-value conversion functions called in a Python loop.
+#
+#   python benchmarks/convertor_benchmark.py
+#   python benchmarks/convertor_benchmark.py --values 10000000
+
+# Original per-value implementations, kept here as the baseline
+def legacy_length_conversion(value, from_unit, to_unit):
+    length_units = {
+     'Meters': 1,
+     'Kilometers': 0.001,
+     'Centimeters': 100,
+     'Millimeters': 1000,
+     'Miles': 0.000621371,
+     'Yards': 1.09361,
+     'Feet': 3.28084,
+     'Inches': 39.3701
+  }
+
+    return value / length_units[from_unit] * length_units[to_unit]
+
+def legacy_temperature_conversion(value, from_unit, to_unit):
+    if from_unit == "Celsius":
+        return (value * 9/5 + 32) if to_unit == "Fahrenheit" else value + 273.15 if to_unit == "Kelvin" else value
+    elif from_unit == "Fahrenheit":
+        return (value - 32) * 5/9 if to_unit == "Celsius" else (value - 32) * 5/9 + 273.15 if to_unit == "Kelvin" else value
+    elif from_unit == "Kelvin":
+        return value - 273.15 if to_unit == "Celsius" else (value - 273.15) * 9/5 + 32 if to_unit == "Fahrenheit" else value
+    return value
+
+CASES = [
+    ("Length", "Miles", "Kilometers", legacy_length_conversion),
+    ("Temperature", "Fahrenheit", "Kelvin", legacy_temperature_conversion),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk unit conversion.")
+    parser.add_argument("--values", type=int, default=1_000_000)
+    parser.add_argument("--legacy-values", type=int, default=200_000, help="values for the slower per-value loop")
+    args = parser.parse_args()
+
+    values = np.random.default_rng(0).random(args.values) * 1000
+    legacy_values = values[:args.legacy_values].tolist()
+
+    print(f"{'conversion':<32} {'legacy values/s':>16} {'engine values/s':>16} {'speedup':>8}")
+    for category, from_unit, to_unit, legacy in CASES:
+        start = time.perf_counter()
+        expected = [legacy(value, from_unit, to_unit) for value in legacy_values]
+        legacy_rate = len(legacy_values) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = convert(values, category, from_unit, to_unit)
+        engine_rate = len(values) / (time.perf_counter() - start)
+
+        assert np.allclose(result[:len(expected)], expected)
+        label = f"{category}: {from_unit} -> {to_unit}"
+        print(f"{label:<32} {legacy_rate:>16,.0f} {engine_rate:>16,.0f} {engine_rate / legacy_rate:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.data_sweeper as data_sweeper
+from core.data_sweeper import streaming_pipeline
+
+# Time of the data_sweeper.py streaming dedupe against pandas drop_duplicates on a
+# generated CSV, with the rows of both checked equal. Also checks the cases that must
+# match exactly: ints above 2**53, a column parsed as int in one chunk and float in
+# another, and partitions split again because they outgrow their budget.
+#
+#   python benchmarks/dedupe_benchmark.py
+#   python benchmarks/dedupe_benchmark.py --rows 5000000
+
+# Function to build a frame with repeated rows, missing values and text
+def make_frame(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": rng.integers(0, rows // 2, rows),
+        "amount": rng.integers(0, 100, rows).astype(float),
+        "region": rng.choice(["north", "south", "east", "west"], rows),
+    })
+    df.loc[rng.random(rows) < 0.05, "amount"] = np.nan
+    return df
+
+# Function to dedupe a CSV file with the streaming pipeline and with pandas
+def dedupe_both(path):
+    with open(path, "rb") as f:
+        streamed = pd.concat(streaming_pipeline(f, ".csv", None, None, dedupe=True, fillna=False), ignore_index=True)
+    return streamed, pd.read_csv(path).drop_duplicates(ignore_index=True)
+
+# Function to check that streaming and pandas keep the same rows of a CSV text
+def check_case(label, text, directory):
+    path = os.path.join(directory, "case.csv")
+    with open(path, "w") as f:
+        f.write(text)
+    streamed, expected = dedupe_both(path)
+    assert streamed.astype(str).equals(expected.astype(str)), f"{label}: {len(streamed)} rows kept, pandas keeps {len(expected)}"
+    print(f"{label}: ok ({len(streamed)} rows)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and check the streaming dedupe.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        check_case("ints above 2**53", "id,v\n9007199254740993,1\n9007199254740992,1\n5,2\n5,2\n", directory)
+        # The first chunk parses "a" as int, the second as float because of the blank
+        mixed = "a,b\n" + "1,x\n" * data_sweeper.STREAM_CHUNK_ROWS + "1.0,x\n,y\n,y\n"
+        check_case("int and float chunks", mixed, directory)
+
+        path = os.path.join(directory, "rows.csv")
+        make_frame(args.rows).to_csv(path, index=False)
+        start = time.perf_counter()
+        streamed, expected = dedupe_both(path)
+        print(f"streaming + pandas: {time.perf_counter() - start:.2f}s for {args.rows:,} rows")
+        assert streamed.equals(expected), "generated rows differ"
+
+        # A small budget forces many partitions, each split again
+        budget = data_sweeper.DEDUPE_PARTITION_BYTES
+        data_sweeper.DEDUPE_PARTITION_BYTES = os.path.getsize(path) // 20
+        try:
+            start = time.perf_counter()
+            with open(path, "rb") as f:
+                split = pd.concat(streaming_pipeline(f, ".csv", None, None, dedupe=True, fillna=False), ignore_index=True)
+            print(f"split partitions:   {time.perf_counter() - start:.2f}s")
+        finally:
+            data_sweeper.DEDUPE_PARTITION_BYTES = budget
+        assert split.equals(expected), "rows differ after splitting partitions"
+    print("ok")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_sweeper_excel import iter_excel_chunks, write_excel_sheets
+
+# Time and peak Python memory of the data_sweeper.py Excel paths on a generated workbook:
+# pandas read_excel/to_excel against the streaming read-only/write-only path.
+#
+#   python benchmarks/excel_benchmark.py
+#   python benchmarks/excel_benchmark.py --rows 500000 --cols 10
+
+# Function to build a synthetic frame with numeric, text and missing values
+def make_frame(rows, cols):
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(cols):
+        if i % 3 == 0:
+            data[f"text_{i}"] = rng.choice(["alpha", "beta", "gamma", "delta"], rows)
+        else:
+            values = rng.random(rows) * 1000
+            values[rng.integers(0, rows, rows // 50)] = np.nan
+            data[f"num_{i}"] = values
+    return pd.DataFrame(data)
+
+# Function to run a step and return (seconds, peak MB); tracing slows Python code
+# down considerably, so time and memory are taken on separate runs
+def measure(func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel read and write paths.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.cols)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "benchmark.xlsx")
+        write_excel_sheets([("Sheet1", [df])], source)
+
+        def pandas_read():
+            pd.read_excel(source, engine="openpyxl")
+
+        def streaming_read():
+            with open(source, "rb") as f:
+                for _ in iter_excel_chunks(f, chunk_size=args.chunk_rows):
+                    pass
+
+        def pandas_write():
+            df.to_excel(os.path.join(tmp, "pandas.xlsx"), index=False, engine="openpyxl")
+
+        def streaming_write():
+            chunks = (df.iloc[start:start + args.chunk_rows] for start in range(0, len(df), args.chunk_rows))
+            write_excel_sheets([("Sheet1", chunks)], os.path.join(tmp, "streaming.xlsx"))
+
+        print(f"workbook: {args.rows:,} rows x {args.cols} columns, {os.path.getsize(source) / (1024 * 1024):.1f} MB")
+        print(f"{'step':<28} {'time (s)':>10} {'peak (MB)':>10}")
+        for label, func in [
+            ("read  pandas.read_excel", pandas_read),
+            ("read  streaming chunks", streaming_read),
+            ("write pandas.to_excel", pandas_write),
+            ("write streaming write-only", streaming_write),
+        ]:
+            elapsed, peak = measure(func)
+            print(f"{label:<28} {elapsed:>10.2f} {peak:>10.1f}")
+
+if __name__ == "__main__":
+    main()
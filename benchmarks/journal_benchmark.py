@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.growth_mindset import Journal
+
+# Insert, search and month-view latency of the growth_mindset.py journal as it grows,
+# against a full scan of every entry with LIKE.
+#
+#   python benchmarks/journal_benchmark.py
+#   python benchmarks/journal_benchmark.py --users 500 --entries-per-user 1000
+
+WORDS = ("learn practice feedback deadline team project mistake progress habit focus "
+         "reading exercise sleep presentation code review mentor patience goal failure "
+         "success effort curious listen plan morning evening week garden budget travel").split()
+
+# Function to write one random sentence of journal text
+def make_text(length):
+    return " ".join(random.choices(WORDS, k=length))
+
+# Function to time a query; returns milliseconds per call
+def latency(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the growth mindset journal.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--entries-per-user", type=int, default=365 * 2)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = Journal(os.path.join(tmp, "journal.db"))
+        total = args.users * args.entries_per_user
+        start = time.perf_counter()
+        for day in range(args.entries_per_user):
+            created_at = time.strftime("%Y-%m-%d 08:00:00", time.localtime(1_700_000_000 + day * 86400))
+            for user in range(args.users):
+                journal.add_entry(f"user{user}", make_text(6), make_text(20), make_text(4), created_at)
+        elapsed = time.perf_counter() - start
+        print(f"insert: {total:,} entries in {elapsed:.1f}s ({total / elapsed:,.0f}/s), "
+              f"{os.path.getsize(os.path.join(tmp, 'journal.db')) / 1024 / 1024:.1f} MB")
+
+        user = f"user{args.users // 2}"
+        month = journal.month_counts(user)[0][0]
+        print(f"month view:           {latency(lambda: journal.month_entries(user, month)):.2f} ms")
+        print(f"search 'feedback':    {latency(lambda: journal.search(user, 'feedback')):.2f} ms")
+        print(f"search 'mentor goal': {latency(lambda: journal.search(user, 'mentor goal')):.2f} ms")
+        print(f"search 'pres':        {latency(lambda: journal.search(user, 'pres')):.2f} ms")
+
+        def scan():
+            return journal.conn.execute(
+                "SELECT * FROM entries WHERE user = ? AND (challenge LIKE ? OR reflection LIKE ? OR achievement LIKE ?) "
+                "ORDER BY id DESC LIMIT 50", (user, "%feedback%", "%feedback%", "%feedback%")
+            ).fetchall()
+        print(f"full scan 'feedback': {latency(scan, repeat=3):.2f} ms")
+        journal.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.password_strength import COMMON_PASSWORDS, analyze_password, check_password_strength
+
+# Per-password latency of the password-strength-meter.py analyzer: the single-pass
+# analyzer against the original four-regex rules. Scores are checked to match.
+#
+#   python benchmarks/password_benchmark.py
+#   python benchmarks/password_benchmark.py --count 200000 --lengths 8 16 64
+
+# Original implementation, kept here as the baseline
+def legacy_check_password_strength(password):
+    feedback = []
+    score = 0
+    max_score = 6
+    if len(password) >= 8:
+        score += 1
+        if len(password) >= 12:
+            score += 1
+    else:
+        feedback.append("❌ Password should be at least 8 characters long.")
+    if re.search(r"[A-Z]", password) and re.search(r"[a-z]", password):
+        score += 1
+    else:
+        feedback.append("❌ Include both uppercase and lowercase letters.")
+    if re.search(r"\d", password):
+        score += 1
+    else:
+        feedback.append("❌ Add at least one number (0-9).")
+    if re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        score += 1
+    else:
+        feedback.append("❌ Include at least one special character (!@#$%^&*(),.?\":{}|<>).")
+    if password.lower() in COMMON_PASSWORDS:
+        feedback.append("❌ This is a very common password. Please choose something more unique.")
+        score = 0
+    if score >= 6:
+        strength_message = "✅ Very Strong Password!"
+    elif score >= 4:
+        strength_message = "⚠️ Moderate Password - Consider adding more security features."
+    else:
+        strength_message = "❌ Weak Password - Improve it using the suggestions above."
+    return strength_message, feedback, int((score / max_score) * 100)
+
+# Function to build random passwords of one length, mixing in patterns and common passwords
+def make_passwords(count, length):
+    alphabet = string.ascii_letters + string.digits + string.punctuation + " "
+    patterns = ["abcdef", "123456", "qwerty", "aaaa", "zyx"]
+    passwords = []
+    for i in range(count):
+        if i % 50 == 0:
+            passwords.append(random.choice(sorted(COMMON_PASSWORDS)))
+            continue
+        password = "".join(random.choices(alphabet, k=length))
+        if i % 3 == 0:
+            pattern = random.choice(patterns)
+            position = random.randrange(max(1, length - len(pattern)))
+            password = (password[:position] + pattern + password[position:])[:max(length, len(pattern))]
+        passwords.append(password)
+    return passwords
+
+# Function to time one function over every password; returns microseconds per password
+def latency(func, passwords):
+    start = time.perf_counter()
+    for password in passwords:
+        func(password)
+    return (time.perf_counter() - start) / len(passwords) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the password analyzer.")
+    parser.add_argument("--count", type=int, default=100_000, help="passwords per length")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[8, 12, 16, 32, 64])
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'length':>6} {'legacy us':>10} {'analyze us':>11} {'check us':>9} {'scores match':>13}")
+    for length in args.lengths:
+        passwords = make_passwords(args.count, length)
+        matches = all(check_password_strength(p)[2] == legacy_check_password_strength(p)[2] for p in passwords)
+        legacy = latency(legacy_check_password_strength, passwords)
+        analyze = latency(analyze_password, passwords)
+        check = latency(check_password_strength, passwords)
+        print(f"{length:>6} {legacy:>10.2f} {analyze:>11.2f} {check:>9.2f} {str(matches):>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.column_profile import PROFILE_QUANTILES, merge_profiles, profile_frame
+
+# Time and accuracy of the one-pass column profile against exact pandas statistics
+# (isna, min/max/mean, nunique and quantile, one pass per statistic), on one frame and
+# merged from several chunks profiled separately.
+#
+#   python benchmarks/profile_benchmark.py
+#   python benchmarks/profile_benchmark.py --rows 5000000 --parts 10
+
+# Function to build a mixed frame with nulls, skew, low- and high-cardinality columns
+def make_frame(rows, seed=0):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "price": rng.lognormal(3, 1, rows),
+        "quantity": rng.integers(0, 500, rows),
+        "score": rng.normal(0, 1, rows),
+        "region": rng.choice(["north", "south", "east", "west"], rows),
+        "customer": pd.Series(rng.integers(0, rows // 4, rows)).astype(str),
+    })
+    df.loc[rng.random(rows) < 0.1, "price"] = np.nan
+    return df
+
+# Function to compute the same statistics exactly with pandas
+def exact_profile(df):
+    report = {}
+    for name in df.columns:
+        series = df[name]
+        stats = {"nulls": int(series.isna().sum()), "distinct": int(series.nunique())}
+        if series.dtype.kind in "if":
+            stats.update(min=series.min(), max=series.max(), mean=series.mean(),
+                         quantiles=series.quantile(list(PROFILE_QUANTILES)).tolist())
+        report[name] = stats
+    return report
+
+# Function to print the worst relative error of the sketched statistics
+def report_errors(label, profile, exact):
+    distinct_error = quantile_error = 0.0
+    for name, stats in exact.items():
+        summary = profile.columns[name].summary()
+        assert summary["Nulls"] == stats["nulls"], name
+        distinct_error = max(distinct_error, abs(summary["Distinct (approx.)"] - stats["distinct"]) / stats["distinct"])
+        if "quantiles" in stats:
+            assert summary["Min"] == stats["min"] and summary["Max"] == stats["max"], name
+            spread = stats["max"] - stats["min"]
+            for estimate, truth in zip((summary["P25"], summary["Median"], summary["P75"]), stats["quantiles"]):
+                quantile_error = max(quantile_error, abs(estimate - truth) / spread)
+    print(f"{label}: distinct within {distinct_error:.2%}, quantiles within {quantile_error:.2%} of the range")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the one-pass column profile.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--parts", type=int, default=4, help="chunks profiled separately and merged")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    start = time.perf_counter()
+    exact = exact_profile(df)
+    print(f"pandas exact:  {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    profile = profile_frame(df)
+    print(f"one pass:      {time.perf_counter() - start:.2f}s")
+
+    size = -(-args.rows // args.parts)
+    parts = [profile_frame(df.iloc[i:i + size]) for i in range(0, args.rows, size)]
+    start = time.perf_counter()
+    merged = merge_profiles(parts)
+    print(f"merge {len(parts)} parts: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    report_errors("one pass", profile, exact)
+    report_errors("merged", merged, exact)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Startup benchmark for the headless core: wall time of a fresh interpreter that imports
+# each core module, against a bare interpreter and one that imports Streamlit.
+#
+#   python benchmarks/startup_benchmark.py
+#   python benchmarks/startup_benchmark.py --runs 20
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    ("(bare interpreter)", "pass"),
+    ("core.convertor", "import core.convertor"),
+    ("core.data_sweeper", "import core.data_sweeper"),
+    ("core.growth_mindset", "import core.growth_mindset"),
+    ("core.password_strength", "import core.password_strength"),
+    ("core.secure_data", "import core.secure_data"),
+    ("core.secure_data_batch", "import core.secure_data_batch"),
+    ("streamlit", "import streamlit"),
+]
+
+# Function to time one fresh interpreter running `code`, in milliseconds
+def time_startup(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the core modules.")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'module':<26} {'min ms':>8} {'median ms':>10} {'over bare':>10}")
+    bare = None
+    for label, code in TARGETS:
+        times = [time_startup(code) for _ in range(args.runs)]
+        best = min(times)
+        if bare is None:
+            bare = best
+        print(f"{label:<26} {best:>8.1f} {statistics.median(times):>10.1f} {best - bare:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import streamlit as st
+import pandas as pd
+from core.convertor import UNIT_REGISTRY, category_units, convert, parse_values
 
 st.markdown(
     """
@@ -56,72 +58,53 @@ st.markdown("<h1> Unit Converter </h1>", unsafe_allow_html=True)
 st.write("Easily convert between different units of measurement with our intuitive converter.")
 
 
-conversion_type = st.sidebar.selectbox("Select Conversion Type", ["Length", "Weight", "Temperature"])
+conversion_type = st.sidebar.selectbox("Select Conversion Type", list(UNIT_REGISTRY))
 value = st.number_input("Enter the value:", value=0.0, min_value=0.0, step=0.1)
 col1, col2 = st.columns(2)
 
-if conversion_type == "Length":
-    with col1:
-        from_unit = st.selectbox("From Unit", ["Meters", "Kilometers", "Centimeters", "Millimeters", "Miles", "Feet", "Yards", "Inches"])
-    with col2:
-        to_unit = st.selectbox("To Unit", ["Meters", "Kilometers", "Centimeters", "Millimeters", "Miles", "Feet", "Yards", "Inches"])
-
-elif conversion_type == "Weight":
-    with col1:
-        from_unit = st.selectbox("From Unit", ["Kilograms", "Grams", "Milligrams", "Pounds", "Ounces"])
-    with col2:
-        to_unit = st.selectbox("To Unit", ["Kilograms", "Grams", "Milligrams", "Pounds", "Ounces"])
-
-elif conversion_type == "Temperature":
-    with col1:
-        from_unit = st.selectbox("From Unit", ["Celsius", "Fahrenheit", "Kelvin"])
-    with col2:
-        to_unit = st.selectbox("To Unit", ["Celsius", "Fahrenheit", "Kelvin"])
-
-
-# converted function
-def length_conversion(value, from_unit, to_unit):
-    length_units = {
-     'Meters': 1,
-     'Kilometers': 0.001,
-     'Centimeters': 100,
-     'Millimeters': 1000,
-     'Miles': 0.000621371,
-     'Yards': 1.09361,
-     'Feet': 3.28084,
-     'Inches': 39.3701
-  }
-
-    return value / length_units[from_unit] * length_units[to_unit]
-
-def weight_conversion(value, from_unit, to_unit):
-    weight_units = {
-    'Kilograms': 1,
-    'Grams': 1000,
-    'Milligrams': 1000000,
-    'Pounds': 2.20462262185,
-    'Ounces': 35.27396194958
-}
-
-    return value / weight_units[from_unit] * weight_units[to_unit]
-
-def temperature_conversion(value, from_unit, to_unit):
-    if from_unit == "Celsius":
-        return (value * 9/5 + 32) if to_unit == "Fahrenheit" else value + 273.15 if to_unit == "Kelvin" else value
-    elif from_unit == "Fahrenheit":
-        return (value - 32) * 5/9 if to_unit == "Celsius" else (value - 32) * 5/9 + 273.15 if to_unit == "Kelvin" else value
-    elif from_unit == "Kelvin":
-        return value - 273.15 if to_unit == "Celsius" else (value - 273.15) * 9/5 + 32 if to_unit == "Fahrenheit" else value
-    return value
+units = category_units(conversion_type)
+with col1:
+    from_unit = st.selectbox("From Unit", units)
+with col2:
+    to_unit = st.selectbox("To Unit", units)
 
 if st.button("Convert"):
-    if conversion_type == "Length":
-        result = length_conversion(value, from_unit, to_unit)
-    elif conversion_type == "Weight":
-        result = weight_conversion(value, from_unit, to_unit)
-    elif conversion_type == "Temperature":
-        result = temperature_conversion(value, from_unit, to_unit)
+    result = convert(value, conversion_type, from_unit, to_unit)
 
     st.markdown(f'<div class="result-box">{value} {from_unit} = {result:.4f} {to_unit}</div>', unsafe_allow_html=True)
 
+st.subheader("Bulk Conversion")
+st.write(f"Convert a whole list or CSV column from {from_unit} to {to_unit} at once.")
+input_method = st.radio("Input", ["Paste values", "Upload CSV"], horizontal=True)
+
+bulk_result = None
+if input_method == "Paste values":
+    pasted = st.text_area("Values (separated by commas, spaces or new lines):")
+    if pasted:
+        try:
+            values = parse_values(pasted)
+            bulk_result = pd.DataFrame({from_unit: values, to_unit: convert(values, conversion_type, from_unit, to_unit)})
+        except ValueError:
+            st.error("Please enter numbers only.")
+else:
+    uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
+    if uploaded_file is not None:
+        bulk_result = pd.read_csv(uploaded_file)
+        numeric_cols = list(bulk_result.select_dtypes(include="number").columns)
+        if numeric_cols:
+            column = st.selectbox("Column to convert", numeric_cols)
+            bulk_result[f"{column} ({to_unit})"] = convert(bulk_result[column], conversion_type, from_unit, to_unit)
+        else:
+            st.error("The file has no numeric columns.")
+            bulk_result = None
+
+if bulk_result is not None:
+    st.dataframe(bulk_result.head(100))
+    st.download_button(
+        "Download converted CSV",
+        data=bulk_result.to_csv(index=False),
+        file_name=f"converted_{conversion_type.lower()}.csv",
+        mime="text/csv"
+    )
+
 st.markdown('<div class="footer">Created by Zayan Ahmed</div>', unsafe_allow_html=True)
\ No newline at end of file
@@ -0,0 +1,12 @@
+# Headless core of the five Streamlit apps. Nothing here imports Streamlit, and heavy
+# dependencies (pandas, NumPy, cryptography, openpyxl, pyarrow) are imported inside the
+# functions that need them, so batch jobs, pool workers and benchmarks start quickly.
+#
+# Each tool has a command line entry point:
+#
+#   python -m core.column_profile --help
+#   python -m core.convertor --help
+#   python -m core.data_sweeper --help
+#   python -m core.growth_mindset --help
+#   python -m core.password_strength --help
+#   python -m core.secure_data --help
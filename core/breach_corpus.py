@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+# On-disk index of breached passwords for password-strength-meter.py. A corpus (one
+# password per line, or SHA-1 hashes in the "HASH:count" format of public breach dumps)
+# is preprocessed once into a file of sorted 64-bit hash prefixes. Lookups binary-search
+# the memory-mapped file, so every worker process shares the same read-only pages
+# through the OS page cache instead of holding its own set.
+#
+#   python -m core.breach_corpus build rockyou.txt breached_passwords.idx
+#   python -m core.breach_corpus build pwned-passwords-sha1.txt breached_passwords.idx --sha1
+#   python -m core.breach_corpus check breached_passwords.idx hunter2 "correct horse"
+#
+# 64 bits of SHA-1 give a false-positive rate of about n / 2^64, which is negligible
+# even for a billion entries, at 8 bytes per entry.
+
+CORPUS_MAGIC = b"PWC1"
+CORPUS_HEADER = struct.Struct(">4sQ")  # magic, entry count
+FANOUT_BITS = 16  # the first 16 bits of a hash select a bucket of the fan-out table
+FANOUT = struct.Struct(f">{(1 << FANOUT_BITS) + 1}Q")  # start index of every bucket, plus the end
+ENTRY = struct.Struct(">Q")
+BUILD_RUN_ENTRIES = 2_000_000  # hashes sorted in memory at a time while building (about 80 MB as Python ints)
+BREACH_CORPUS_FILE = os.environ.get("PASSWORD_BREACH_CORPUS", "breached_passwords.idx")
+
+# Function to hash a password to the 64-bit prefix stored in the index
+def password_hash(password):
+    return int.from_bytes(hashlib.sha1(password.encode("utf-8")).digest()[:8], "big")
+
+# Function to read hash prefixes from a corpus file, one entry per line
+def iter_corpus_hashes(path, sha1=False):
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue
+            if sha1:
+                # "HASH" or "HASH:count"; only the first 16 hex digits are kept
+                yield int(line[:16], 16)
+            else:
+                yield int.from_bytes(hashlib.sha1(line).digest()[:8], "big")
+
+# Function to sort hashes in runs of BUILD_RUN_ENTRIES and spill each run to a temp file
+def write_sorted_runs(hashes, run_dir, run_entries=BUILD_RUN_ENTRIES):
+    paths = []
+    run = array("Q")
+    for value in hashes:
+        run.append(value)
+        if len(run) >= run_entries:
+            paths.append(write_run(run, run_dir))
+            run = array("Q")
+    if run or not paths:
+        paths.append(write_run(run, run_dir))
+    return paths
+
+# Function to write one run as big-endian 64-bit entries
+def write_run(run, run_dir):
+    fd, path = tempfile.mkstemp(suffix=".run", dir=run_dir)
+    with os.fdopen(fd, "wb") as f:
+        sorted_run = array("Q", sorted(run))
+        if sys.byteorder == "little":
+            sorted_run.byteswap()
+        sorted_run.tofile(f)
+    return path
+
+# Function to read back the entries of a run in order
+def iter_run(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(ENTRY.size * 65536)
+            if not block:
+                break
+            for (value,) in ENTRY.iter_unpack(block):
+                yield value
+
+# Function to build an index from a corpus file; memory is bounded by BUILD_RUN_ENTRIES
+# because runs are sorted separately and merged from disk. Returns the entry count.
+def build_corpus_index(source_path, index_path, sha1=False, run_entries=BUILD_RUN_ENTRIES):
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    with tempfile.TemporaryDirectory(dir=index_dir) as run_dir:
+        runs = write_sorted_runs(iter_corpus_hashes(source_path, sha1), run_dir, run_entries)
+        fanout = [0] * ((1 << FANOUT_BITS) + 1)
+        count = 0
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * (CORPUS_HEADER.size + FANOUT.size))  # filled in once the count is known
+            previous = None
+            buffer = bytearray()
+            for value in heapq.merge(*(iter_run(path) for path in runs)):
+                if value == previous:
+                    continue
+                previous = value
+                buffer += ENTRY.pack(value)
+                fanout[(value >> (64 - FANOUT_BITS)) + 1] += 1
+                count += 1
+                if len(buffer) >= 1 << 20:
+                    f.write(buffer)
+                    buffer.clear()
+            f.write(buffer)
+
+            # Bucket sizes to cumulative start indexes
+            for bucket in range(1, len(fanout)):
+                fanout[bucket] += fanout[bucket - 1]
+            f.seek(0)
+            f.write(CORPUS_HEADER.pack(CORPUS_MAGIC, count))
+            f.write(FANOUT.pack(*fanout))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, index_path)
+    return count
+
+# Read-only view of a built index. The file is memory-mapped, so opening it costs no
+# memory up front and pages are shared with every other process using the same file.
+class BreachCorpus:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = CORPUS_HEADER.unpack_from(self.map, 0)
+        if magic != CORPUS_MAGIC:
+            raise ValueError(f"{path} is not a breached-password index")
+        self.entries_offset = CORPUS_HEADER.size + FANOUT.size
+
+    def __len__(self):
+        return self.count
+
+    # Function to check a 64-bit hash: the fan-out table narrows the search to one
+    # bucket, then a binary search reads only a handful of entries
+    def contains_hash(self, value):
+        bucket = value >> (64 - FANOUT_BITS)
+        low, high = struct.unpack_from(">2Q", self.map, CORPUS_HEADER.size + bucket * ENTRY.size)
+        while low < high:
+            middle = (low + high) // 2
+            entry = ENTRY.unpack_from(self.map, self.entries_offset + middle * ENTRY.size)[0]
+            if entry < value:
+                low = middle + 1
+            elif entry > value:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __contains__(self, password):
+        return self.contains_hash(password_hash(password))
+
+    def close(self):
+        self.map.close()
+
+# Function to open the default index if it has been built, or return None
+def open_breach_corpus(path=BREACH_CORPUS_FILE):
+    if not path or not os.path.exists(path):
+        return None
+    return BreachCorpus(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.breach_corpus", description="Build or query a breached-password index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="preprocess a corpus file into an index")
+    build.add_argument("source", help="one password per line, or SHA-1 hashes with --sha1")
+    build.add_argument("index", nargs="?", default=BREACH_CORPUS_FILE)
+    build.add_argument("--sha1", action="store_true", help='lines are SHA-1 hex hashes, optionally "HASH:count"')
+    check = commands.add_parser("check", help="look up passwords in an index")
+    check.add_argument("index")
+    check.add_argument("passwords", nargs="*", help="passwords to check (default: one per line from stdin)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        count = build_corpus_index(args.source, args.index, args.sha1)
+        size = os.path.getsize(args.index)
+        print(f"Indexed {count:,} unique hashes into {args.index} ({size / 1024 / 1024:.1f} MB) in {time.perf_counter() - start:.1f}s")
+    else:
+        corpus = BreachCorpus(args.index)
+        for password in args.passwords or (line.rstrip("\r\n") for line in sys.stdin):
+            print(f"{'breached' if password in corpus else 'not found'}\t{password}")
+
+if __name__ == "__main__":
+    main()
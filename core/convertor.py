@@ -0,0 +1,177 @@
+import argparse
+import numbers
+import re
+import sys
+
+# Conversion engine used by convertor.py. Every conversion is an affine map
+# (value * scale + offset), so a whole NumPy array or pandas Series is converted
+# in one vectorized pass. The registry is plain Python, and NumPy is only imported
+# once an array is converted, so scalar conversions start without it.
+#
+#   python -m core.convertor Length Meters Feet 1 2.5 10
+#   echo "0 37 100" | python -m core.convertor Temperature Celsius Fahrenheit
+#   python -m core.convertor --list
+
+# Units per base unit (meters, kilograms), as in the original converter tables
+LENGTH_UNITS = {
+    'Meters': 1,
+    'Kilometers': 0.001,
+    'Centimeters': 100,
+    'Millimeters': 1000,
+    'Miles': 0.000621371,
+    'Yards': 1.09361,
+    'Feet': 3.28084,
+    'Inches': 39.3701
+}
+
+WEIGHT_UNITS = {
+    'Kilograms': 1,
+    'Grams': 1000,
+    'Milligrams': 1000000,
+    'Pounds': 2.20462262185,
+    'Ounces': 35.27396194958
+}
+
+# (scale, offset) that take each temperature unit to Celsius
+TEMPERATURE_UNITS = {
+    'Celsius': (1.0, 0.0),
+    'Fahrenheit': (5 / 9, -160 / 9),
+    'Kelvin': (1.0, -273.15)
+}
+
+TIME_UNITS = {
+    'Seconds': 1,
+    'Minutes': 60,
+    'Hours': 3600,
+    'Days': 86400,
+    'Weeks': 604800
+}
+
+# Function to raise length units to a power, e.g. square or cubic units
+def power_units(prefix, power, names=None):
+    return {f"{prefix} {unit}": ((1 / LENGTH_UNITS[unit]) ** power, 0.0) for unit in names or LENGTH_UNITS}
+
+# Function to build "<length> per <time>" units from the length and time tables
+def speed_units(pairs):
+    return {f"{length} per {time[:-1]}": ((1 / LENGTH_UNITS[length]) / TIME_UNITS[time], 0.0) for length, time in pairs}
+
+# Every category maps unit name -> (scale, offset) to the category's base unit
+UNIT_DEFINITIONS = {
+    "Length": {unit: (1 / factor, 0.0) for unit, factor in LENGTH_UNITS.items()},
+    "Weight": {unit: (1 / factor, 0.0) for unit, factor in WEIGHT_UNITS.items()},
+    "Temperature": TEMPERATURE_UNITS,
+    "Area": {
+        **power_units("Square", 2),
+        'Hectares': (10000.0, 0.0),
+        'Acres': (4046.8564224, 0.0)
+    },
+    "Volume": {
+        **power_units("Cubic", 3, ["Meters", "Centimeters", "Feet", "Inches"]),
+        'Liters': (0.001, 0.0),
+        'Milliliters': (0.000001, 0.0),
+        'US Gallons': (0.003785411784, 0.0),
+        'US Quarts': (0.000946352946, 0.0),
+        'US Cups': (0.0002365882365, 0.0),
+        'Imperial Gallons': (0.00454609, 0.0)
+    },
+    "Speed": {
+        **speed_units([("Meters", "Seconds"), ("Kilometers", "Hours"), ("Miles", "Hours"), ("Feet", "Seconds")]),
+        'Knots': (1852 / 3600, 0.0)
+    },
+    "Time": {unit: (float(seconds), 0.0) for unit, seconds in TIME_UNITS.items()},
+    "Data Size": {
+        'Bits': (0.125, 0.0),
+        'Bytes': (1.0, 0.0),
+        'Kilobytes': (1e3, 0.0),
+        'Megabytes': (1e6, 0.0),
+        'Gigabytes': (1e9, 0.0),
+        'Terabytes': (1e12, 0.0),
+        'Kibibytes': (2.0 ** 10, 0.0),
+        'Mebibytes': (2.0 ** 20, 0.0),
+        'Gibibytes': (2.0 ** 30, 0.0)
+    },
+}
+
+# Function to precompute a category's dense conversion matrices:
+# scale[i][j] and offset[i][j] convert unit i to unit j
+def build_category(units):
+    names = list(units)
+    scales = [float(units[name][0]) for name in names]
+    offsets = [float(units[name][1]) for name in names]
+    return {
+        "units": names,
+        "index": {name: i for i, name in enumerate(names)},
+        "scale": [[from_scale / to_scale for to_scale in scales] for from_scale in scales],
+        "offset": [[(from_offset - to_offset) / to_scale for to_offset, to_scale in zip(offsets, scales)] for from_offset in offsets],
+    }
+
+# Built once at import; every unit pair then resolves with two dict lookups
+UNIT_REGISTRY = {category: build_category(units) for category, units in UNIT_DEFINITIONS.items()}
+
+# Function to add or replace a unit category at runtime
+def register_category(category, units):
+    UNIT_DEFINITIONS[category] = dict(units)
+    UNIT_REGISTRY[category] = build_category(UNIT_DEFINITIONS[category])
+
+# Function to list the units of a category, in definition order
+def category_units(category):
+    return UNIT_REGISTRY[category]["units"]
+
+# Function to get the (scale, offset) pair that converts from_unit to to_unit
+def conversion_affine(category, from_unit, to_unit):
+    entry = UNIT_REGISTRY[category]
+    i = entry["index"][from_unit]
+    j = entry["index"][to_unit]
+    return entry["scale"][i][j], entry["offset"][i][j]
+
+# Function to convert a scalar, list, NumPy array or pandas Series in one affine pass.
+# Series keep their index; scalars come back as floats.
+def convert(values, category, from_unit, to_unit):
+    scale, offset = conversion_affine(category, from_unit, to_unit)
+    if isinstance(values, numbers.Number):
+        return values * scale + offset
+    if not hasattr(values, "dtype"):
+        import numpy as np
+        values = np.asarray(values, dtype="float64")
+    result = values * scale
+    if offset:
+        result += offset
+    return result
+
+# Function to parse pasted values separated by commas, semicolons, spaces or new lines
+def parse_values(text):
+    import numpy as np
+    tokens = [token for token in re.split(r"[,;\s]+", text.strip()) if token]
+    return np.array(tokens, dtype="float64")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.convertor", description="Convert values between units.")
+    parser.add_argument("category", nargs="?", help="unit category, e.g. Length")
+    parser.add_argument("from_unit", nargs="?")
+    parser.add_argument("to_unit", nargs="?")
+    parser.add_argument("values", nargs="*", type=float, help="values to convert (default: read from stdin)")
+    parser.add_argument("--list", action="store_true", help="list the categories and their units")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for category in UNIT_REGISTRY:
+            print(f"{category}: {', '.join(category_units(category))}")
+        return
+    if args.to_unit is None:
+        parser.error("category, from_unit and to_unit are required")
+    if args.category not in UNIT_REGISTRY:
+        parser.error(f"unknown category {args.category!r}; see --list")
+    for unit in (args.from_unit, args.to_unit):
+        if unit not in UNIT_REGISTRY[args.category]["index"]:
+            parser.error(f"unknown {args.category} unit {unit!r}; see --list")
+
+    # Values from the command line stay scalar; stdin is converted as one array
+    if args.values:
+        results = [convert(value, args.category, args.from_unit, args.to_unit) for value in args.values]
+    else:
+        results = convert(parse_values(sys.stdin.read()), args.category, args.from_unit, args.to_unit).tolist()
+    for result in results:
+        print(f"{result:.6g}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+import argparse
+import importlib.util
+import operator
+import os
+import pickle
+import tempfile
+import time
+from io import BytesIO, TextIOWrapper
+
+from core.data_sweeper_excel import excel_sheet_names, iter_excel_chunks, write_excel_sheets, write_excel_frame
+
+# Reading, cleaning, streaming and writing for data_sweeper.py. pandas, NumPy and pyarrow
+# are imported inside the functions that use them, so importing this module is cheap.
+#
+#   python -m core.data_sweeper sales.csv sales.xlsx --dedupe --fillna
+#   python -m core.data_sweeper book.xlsx book.csv --sheet Orders --columns id,total
+
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+STREAM_CHUNK_ROWS = 100_000
+DEDUPE_PARTITION_BYTES = 32 * 1024 * 1024  # input bytes per dedupe partition, loaded one at a time
+DEDUPE_MAX_PARTITIONS = 128  # spill files open at once; a partition still too big is split again
+DEDUPE_MAX_LEVELS = 4  # rounds of splitting before a partition is loaded whatever its size
+ALL_SHEETS = "(all sheets)"
+CATEGORY_RATIO = 0.5  # text columns with fewer distinct values than this share of rows become categories
+OUTPUT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+COLUMNAR_FORMATS = {
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Feather": (".feather", "application/vnd.apache.arrow.file"),
+}
+if PARQUET_AVAILABLE:
+    OUTPUT_FORMATS.update(COLUMNAR_FORMATS)
+COMPRESSION_OPTIONS = {
+    "Parquet": ["snappy", "zstd", "gzip", "brotli", "none"],
+    "Feather": ["lz4", "zstd", "uncompressed"],
+}
+COLUMNAR_EXTENSIONS = (".parquet", ".feather", ".arrow")
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx") + (COLUMNAR_EXTENSIONS if PARQUET_AVAILABLE else ())
+FILTER_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Schema of a Parquet or Feather file, read from the file footer only
+def read_columnar_schema(file, file_extension):
+    import pyarrow.ipc
+    import pyarrow.parquet
+    file.seek(0)
+    if file_extension == ".parquet":
+        return pyarrow.parquet.read_schema(file)
+    return pyarrow.ipc.open_file(file).schema
+
+# Convert a filter value typed by the user to the column's type
+def coerce_filter_value(schema, column, value):
+    import pyarrow.types
+    field_type = schema.field(column).type
+    if pyarrow.types.is_integer(field_type):
+        return int(value)
+    if pyarrow.types.is_floating(field_type):
+        return float(value)
+    return value
+
+# Read a Parquet or Feather file with column projection and row filters. Both formats
+# read and decompress only the projected columns. Parquet filters are pushed down so whole
+# row groups are skipped using their statistics; Feather has no row-group statistics, so
+# its filters are applied after the projected read.
+def read_columnar(file, file_extension, parse_options):
+    import pyarrow.feather
+    import pyarrow.parquet
+    columns = list(parse_options.get("columns", ())) or None
+    filters = list(parse_options.get("filters", ())) or None
+    file.seek(0)
+    if file_extension == ".parquet":
+        return pyarrow.parquet.read_table(file, columns=columns, filters=filters).to_pandas()
+
+    needed = columns + [column for column, _, _ in filters or () if column not in columns] if columns else None
+    df = pyarrow.feather.read_table(file, columns=needed).to_pandas()
+    for column, op, value in filters or ():
+        df = df[FILTER_OPERATORS[op](df[column], value)]
+    return df[columns] if columns else df
+
+# Text columns that look low-cardinality in the sample are read as categories
+def guess_category_columns(sample):
+    return [
+        col for col in sample.select_dtypes(include=['object', 'string']).columns
+        if len(sample) and sample[col].nunique() / len(sample) < CATEGORY_RATIO
+    ]
+
+# Shrink numeric columns to the smallest dtype that holds every value exactly
+def downcast_frame(df):
+    import pandas as pd
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include=['floating']).columns:
+        downcast = df[col].astype("float32")
+        if ((downcast == df[col]) | df[col].isna()).all():
+            df[col] = downcast
+    return df
+
+# Read a CSV or Excel file with the selected columns and dtypes from the sniffing pass
+def read_tabular(file, file_extension, parse_options):
+    import pandas as pd
+    options = {}
+    if "usecols" in parse_options:
+        options["usecols"] = list(parse_options["usecols"])
+    if "dtype" in parse_options:
+        options["dtype"] = dict(parse_options["dtype"])
+    if "sheet_name" in parse_options:
+        options["sheet_name"] = parse_options["sheet_name"]
+    file.seek(0)
+    if file_extension == ".csv":
+        df = pd.read_csv(file, **options)
+    else:
+        df = pd.read_excel(file, **options)
+    if parse_options.get("downcast"):
+        df = downcast_frame(df)
+    return df
+
+def apply_cleaning_step(df, step):
+    if step == "dedupe":
+        return df.drop_duplicates()
+    if step == "fillna":
+        df = df.copy()
+        numeric_cols = df.select_dtypes(include=['number']).columns
+        df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
+        return df
+    return df
+
+# Out-of-core processing for CSV and Excel files larger than memory. Every pass reads
+# the file in chunks of STREAM_CHUNK_ROWS rows, so peak memory depends on the chunk size only.
+def iter_csv_chunks(file, usecols=None):
+    import pandas as pd
+    file.seek(0)
+    return pd.read_csv(file, chunksize=STREAM_CHUNK_ROWS, usecols=usecols)
+
+def iter_chunks(file, file_extension, sheet_name=None, usecols=None):
+    if file_extension == ".csv":
+        return iter_csv_chunks(file, usecols)
+    return iter_excel_chunks(file, sheet_name, usecols, chunk_size=STREAM_CHUNK_ROWS)
+
+# Size in bytes of an upload or an open file, used for progress reporting
+def file_size(file):
+    size = getattr(file, "size", None)
+    if size is None:
+        size = os.fstat(file.fileno()).st_size
+    return size
+
+# Hash each row to pick its dedupe partition; each `level` of splitting uses its own hash
+# key. Numeric columns are hashed as float64 so a value hashes the same whether its chunk
+# was parsed as int or float. The hash only places rows, so large ints that share a
+# float64 merely share a partition; rows are compared with their own values.
+def row_hashes(chunk, level=0):
+    import pandas as pd
+    numeric_cols = chunk.select_dtypes(include=['number']).columns
+    return pd.util.hash_pandas_object(
+        chunk.astype({col: "float64" for col in numeric_cols}), index=False, hash_key=f"data-sweeper-{level:03d}",
+    )
+
+# Number of partitions for `size` bytes of rows, so that each fits in memory on its own
+def dedupe_partitions(size):
+    return min(DEDUPE_MAX_PARTITIONS, max(1, -(-size // DEDUPE_PARTITION_BYTES)))
+
+# Function to read back every frame pickled one after another into a spill file
+def read_spilled_frames(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+# Function to spill frames, indexed by row number, to `partitions` files by row hash, so
+# equal rows always share a file. Returns the paths of the files that got rows.
+def spill_partitions(frames, stem, partitions, level):
+    import numpy as np
+    paths = [f"{stem}.{i}" for i in range(partitions)]
+    handles = [open(path, "wb") for path in paths]
+    try:
+        for frame in frames:
+            part = row_hashes(frame, level).to_numpy() % np.uint64(partitions)
+            for i in np.unique(part):
+                pickle.dump(frame[part == i], handles[i], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for handle in handles:
+            handle.close()
+    used = []
+    for path in paths:
+        if os.path.getsize(path):
+            used.append(path)
+        else:
+            os.remove(path)
+    return used
+
+# Function to mark the rows of one spill file that repeat an earlier row. A file larger
+# than DEDUPE_PARTITION_BYTES is split again with the next level's hash, so at most
+# DEDUPE_MAX_PARTITIONS files are open at once however large the input. Columns parsed
+# as int in some chunks and float in others are widened to float by concat, as a whole
+# read would do; every other column keeps its own values, so large ints stay exact.
+def mark_duplicates(path, level, duplicates):
+    import numpy as np
+    import pandas as pd
+    size = os.path.getsize(path)
+    if size > DEDUPE_PARTITION_BYTES and level < DEDUPE_MAX_LEVELS:
+        parts = spill_partitions(read_spilled_frames(path), path, dedupe_partitions(size), level)
+        os.remove(path)
+        # Rows that all hash alike, e.g. one row repeated, are not split any further
+        next_level = level + 1 if len(parts) > 1 else DEDUPE_MAX_LEVELS
+        for part in parts:
+            mark_duplicates(part, next_level, duplicates)
+        return
+    spilled = pd.concat(read_spilled_frames(path))
+    os.remove(path)
+    numbers = spilled.index.to_numpy(dtype=np.int64)[spilled.duplicated().to_numpy()]
+    np.bitwise_or.at(duplicates, numbers >> 3, (1 << (numbers & 7)).astype(np.uint8))
+
+# First dedupe pass: find the rows that repeat an earlier row, in bounded memory. Rows are
+# spilled with their row numbers to partition files by hash, and each file is then
+# deduplicated on its own by comparing whole rows, so a hash collision never drops a
+# distinct row. Returns a bitmap of the duplicate row numbers, one bit per row.
+def find_duplicate_rows(chunks, size=0):
+    import numpy as np
+    rows = 0
+
+    def numbered():
+        nonlocal rows
+        for chunk in chunks:
+            frame = chunk.set_axis(range(chunk.shape[1]), axis=1)
+            frame.index = np.arange(rows, rows + len(chunk))
+            rows += len(chunk)
+            yield frame
+
+    with tempfile.TemporaryDirectory(prefix="dedupe-") as spill_dir:
+        paths = spill_partitions(numbered(), os.path.join(spill_dir, "rows"), dedupe_partitions(size), 0)
+        duplicates = np.zeros((rows + 7) // 8, dtype=np.uint8)
+        for path in paths:
+            mark_duplicates(path, 1, duplicates)
+    return duplicates
+
+# Second dedupe pass: drop the rows marked in the bitmap from find_duplicate_rows
+def drop_rows(chunks, duplicates):
+    import numpy as np
+    rows = 0
+    for chunk in chunks:
+        numbers = np.arange(rows, rows + len(chunk))
+        rows += len(chunk)
+        yield chunk[((duplicates[numbers >> 3] >> (numbers & 7)) & 1) == 0]
+
+# First pass: column means from running sums and counts of the numeric columns
+def stream_column_means(chunks):
+    sums = {}
+    counts = {}
+    for chunk in chunks:
+        numeric = chunk.select_dtypes(include=['number'])
+        for col, total in numeric.sum().items():
+            sums[col] = sums.get(col, 0.0) + float(total)
+        for col, count in numeric.count().items():
+            counts[col] = counts.get(col, 0) + int(count)
+    return {col: sums[col] / counts[col] for col in sums if counts[col]}
+
+# Second pass: fill missing values in numeric columns with the precomputed means
+def fill_chunks(chunks, means):
+    for chunk in chunks:
+        numeric_cols = [col for col in chunk.select_dtypes(include=['number']).columns if col in means]
+        if numeric_cols:
+            chunk = chunk.fillna({col: means[col] for col in numeric_cols})
+        yield chunk
+
+def write_csv_chunks(chunks, path):
+    with open(path, "w", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=(i == 0), index=False)
+
+# Build the dedupe and fill passes over one CSV file or Excel sheet
+def streaming_pipeline(file, file_extension, sheet_name, usecols, dedupe, fillna, progress=None):
+    total = file_size(file) if progress is not None else None
+
+    def chunks():
+        for chunk in iter_chunks(file, file_extension, sheet_name, usecols):
+            if progress is not None and file_extension == ".csv":
+                progress(min(file.tell() / max(total, 1), 1.0))
+            yield chunk
+
+    duplicates = find_duplicate_rows(chunks(), file_size(file)) if dedupe else None
+    means = None
+    if fillna:
+        source = drop_rows(chunks(), duplicates) if dedupe else chunks()
+        means = stream_column_means(source)
+
+    pipeline = chunks()
+    if dedupe:
+        pipeline = drop_rows(pipeline, duplicates)
+    if fillna:
+        pipeline = fill_chunks(pipeline, means)
+    return pipeline
+
+# Run the selected passes over a file and write the result to `path` as CSV or Excel.
+# With ALL_SHEETS, every sheet of an Excel file is processed into its own output sheet.
+def write_streaming_output(file, file_extension, path, conversion_type, sheet_name=None, usecols=None,
+                           dedupe=False, fillna=False, progress=None, names=None):
+    if conversion_type == "CSV":
+        write_csv_chunks(streaming_pipeline(file, file_extension, sheet_name, usecols, dedupe, fillna, progress), path)
+    elif sheet_name == ALL_SHEETS:
+        names = names or excel_sheet_names(file)
+
+        def sheets():
+            for i, name in enumerate(names):
+                if progress is not None:
+                    progress(i / len(names))
+                yield name, streaming_pipeline(file, file_extension, name, usecols, dedupe, fillna)
+
+        write_excel_sheets(sheets(), path)
+    else:
+        write_excel_sheets([(sheet_name or "Sheet1", streaming_pipeline(file, file_extension, sheet_name, usecols, dedupe, fillna, progress))], path)
+    return path
+
+# Largest-Triangle-Three-Buckets downsampling: keeps `threshold` points that preserve
+# the visual shape of the series (peaks and troughs) instead of plain striding
+def lttb_indices(y, threshold):
+    import numpy as np
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype="float64")
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype="int64")
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+# Reduce the chart columns to at most `budget` points on the server
+def aggregate_for_chart(df, chart_type, chart_columns, budget):
+    import numpy as np
+    import pandas as pd
+    data = df[list(chart_columns)]
+    n = len(data)
+    if chart_type == "Histogram":
+        values = data.iloc[:, 0].dropna().to_numpy(dtype="float64")
+        counts, edges = np.histogram(values, bins=min(budget, 500))
+        return pd.DataFrame({"count": counts}, index=pd.Index((edges[:-1] + edges[1:]) / 2, name=chart_columns[0]))
+    if n <= budget:
+        return data
+    if chart_type == "Line (LTTB)":
+        # Union of the points each series keeps, so every series keeps its extremes
+        keep = set()
+        for col in chart_columns:
+            y = data[col].astype("float64").interpolate(limit_direction="both").fillna(0).to_numpy()
+            keep.update(lttb_indices(y, max(3, budget // len(chart_columns))).tolist())
+        return data.iloc[sorted(keep)]
+    buckets = np.arange(n) * budget // n
+    binned = data.groupby(buckets).mean()
+    binned.index = pd.Index(np.arange(len(binned)) * n // budget, name="row")
+    return binned
+
+def write_frame(df, conversion_type, out, compression=None):
+    if conversion_type == "CSV":
+        # Wrap the binary stream for pandas, then detach so the caller's stream stays open
+        text = TextIOWrapper(out, encoding="utf-8", newline="")
+        df.to_csv(text, index=False)
+        text.flush()
+        text.detach()
+    elif conversion_type == "Parquet":
+        df.to_parquet(out, index=False, compression=None if compression == "none" else compression)
+    elif conversion_type == "Feather":
+        df.reset_index(drop=True).to_feather(out, compression=compression)
+    else:
+        write_excel_frame(df, out)
+
+# Time each output format on a frame and report write time and output size
+def benchmark_formats(df):
+    import pandas as pd
+    rows = []
+    for conversion_type in OUTPUT_FORMATS:
+        for compression in COMPRESSION_OPTIONS.get(conversion_type, [None]):
+            buffer = BytesIO()
+            start = time.perf_counter()
+            write_frame(df, conversion_type, buffer, compression)
+            elapsed = time.perf_counter() - start
+            rows.append({
+                "Format": conversion_type,
+                "Compression": compression or "-",
+                "Write Time (s)": round(elapsed, 3),
+                "Size (KB)": round(buffer.tell() / 1024, 1),
+            })
+    return pd.DataFrame(rows).sort_values("Write Time (s)", ignore_index=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.data_sweeper", description="Clean and convert a CSV, Excel, Parquet or Feather file.")
+    parser.add_argument("input")
+    parser.add_argument("output", help="output file; the format follows its extension")
+    parser.add_argument("--sheet", help=f"Excel sheet to read, or {ALL_SHEETS!r} for every sheet (Excel output only)")
+    parser.add_argument("--columns", help="comma-separated columns to keep")
+    parser.add_argument("--dedupe", action="store_true", help="remove duplicate rows")
+    parser.add_argument("--fillna", action="store_true", help="fill missing numeric values with column means")
+    parser.add_argument("--compression", help="Parquet or Feather compression")
+    args = parser.parse_args(argv)
+
+    file_extension = os.path.splitext(args.input)[-1].lower()
+    output_extension = os.path.splitext(args.output)[-1].lower()
+    conversion_type = next((name for name, (extension, _) in OUTPUT_FORMATS.items() if extension == output_extension), None)
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        parser.error(f"unsupported input type: {file_extension}")
+    if conversion_type is None:
+        parser.error(f"unsupported output type: {output_extension}")
+    usecols = [col.strip() for col in args.columns.split(",")] if args.columns else None
+
+    start = time.perf_counter()
+    with open(args.input, "rb") as file:
+        if file_extension in (".csv", ".xlsx") and conversion_type in ("CSV", "Excel"):
+            # Row-oriented input and output: stream in chunks, never holding the whole file
+            write_streaming_output(file, file_extension, args.output, conversion_type, args.sheet, usecols, args.dedupe, args.fillna)
+        else:
+            if file_extension in COLUMNAR_EXTENSIONS:
+                df = read_columnar(file, file_extension, {"columns": tuple(usecols)} if usecols else {})
+            else:
+                parse_options = {"usecols": tuple(usecols)} if usecols else {}
+                if args.sheet:
+                    parse_options["sheet_name"] = args.sheet
+                df = read_tabular(file, file_extension, parse_options)
+            for step, enabled in (("dedupe", args.dedupe), ("fillna", args.fillna)):
+                if enabled:
+                    df = apply_cleaning_step(df, step)
+            with open(args.output, "wb") as out:
+                write_frame(df, conversion_type, out, args.compression)
+    print(f"Wrote {args.output} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Streaming Excel reader and writer used by data_sweeper.py. Rows go through openpyxl's
+# read-only and write-only modes, so the full workbook object model is never built.
+# pandas and openpyxl are imported on first use.
+
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_CHUNK_ROWS = 100_000
+
+# Sheet names of a workbook, read without loading any cells
+def excel_sheet_names(file):
+    from openpyxl import load_workbook
+    file.seek(0)
+    workbook = load_workbook(file, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+# Read one sheet row by row and yield DataFrames of at most chunk_size rows.
+# The first row is the header, as with pd.read_excel.
+def iter_excel_chunks(file, sheet_name=None, usecols=None, chunk_size=EXCEL_CHUNK_ROWS):
+    import pandas as pd
+    from openpyxl import load_workbook
+    file.seek(0)
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+        positions = [header.index(col) for col in usecols] if usecols else None
+        columns = list(usecols) if usecols else header
+
+        batch = []
+        for row in rows:
+            if positions is not None:
+                row = tuple(row[i] if i < len(row) else None for i in positions)
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+    finally:
+        workbook.close()
+
+# Write (sheet_name, chunks) pairs to a write-only workbook, row by row.
+# A sheet that reaches Excel's row limit continues on a new "<name> (2)" sheet.
+def write_excel_sheets(sheets, target):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    for sheet_name, chunks in sheets:
+        sheet = None
+        sheet_rows = 0
+        part = 1
+        header = None
+        for chunk in chunks:
+            if header is None:
+                header = list(chunk.columns)
+            rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+            for row in rows:
+                if sheet is None or sheet_rows >= EXCEL_MAX_ROWS:
+                    sheet = workbook.create_sheet(sheet_name if part == 1 else f"{sheet_name} ({part})")
+                    sheet.append(header)
+                    sheet_rows = 1
+                    part += 1
+                sheet.append(row)
+                sheet_rows += 1
+        if sheet is None:
+            sheet = workbook.create_sheet(sheet_name)
+            if header is not None:
+                sheet.append(header)
+    if not workbook.worksheets:
+        workbook.create_sheet("Sheet1")
+    workbook.save(target)
+
+# Write a DataFrame through the streaming writer in slices, so the object-dtype copy
+# made for each row batch stays at chunk_size rows
+def write_excel_frame(df, target, sheet_name="Sheet1", chunk_size=EXCEL_CHUNK_ROWS):
+    chunks = (df.iloc[start:start + chunk_size] for start in range(0, max(len(df), 1), chunk_size))
+    write_excel_sheets([(sheet_name, chunks)], target)
@@ -0,0 +1,189 @@
+import argparse
+import getpass
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+# Prompts, responses and the reflection journal used by growth_mindset.py.
+#
+#   python -m core.growth_mindset --challenge "public speaking" --achievement "finished a 10k"
+#   python -m core.growth_mindset --user sam --reflection "asked for feedback early" --save
+#   python -m core.growth_mindset --user sam --search "feedback"
+#   python -m core.growth_mindset --user sam --month 2026-10
+#
+# Journal commands prompt for the passphrase that, with the name, opens the journal.
+
+QUOTE = "We can't become what we need to be by remaining what we are. —Oprah Winfrey"
+JOURNAL_FILE = os.environ.get("GROWTH_JOURNAL", "growth_journal.db")
+JOURNAL_FIELDS = ["challenge", "reflection", "achievement"]
+SEARCH_LIMIT = 50  # newest matching entries returned by a search
+JOURNAL_KEY_ITERATIONS = 200_000  # PBKDF2 rounds turning a name and passphrase into a journal key
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def challenge_message(challenge):
+    return f"You are facing: {challenge}. Keep pushing forward towards goal!"
+
+def reflection_message(reflection):
+    return f"🌟 Greate Insight! Your reflection: {reflection}"
+
+def achievement_message(achievement):
+    return f"🎉 Amazing! you achived: {achievement}"
+
+# Function to split text into lowercase search terms, in order, without duplicates
+def tokenize(text):
+    return list(dict.fromkeys(term.casefold() for term in TOKEN_PATTERN.findall(text)))
+
+# Function to get the first term after every term starting with `prefix`, or None when
+# there is none: the prefix is empty or made only of the last code point
+def prefix_end(prefix):
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    if 0xD800 <= code <= 0xDFFF:
+        code = 0xE000  # surrogates cannot be stored as UTF-8, so skip past them
+    return prefix[:-1] + chr(code)
+
+# Function to derive the key a journal is filed under from its owner's name and passphrase.
+# Only the key is stored, so entries can be read only by someone who knows both.
+def journal_key(name, passphrase, iterations=JOURNAL_KEY_ITERATIONS):
+    salt = ("growth-journal:" + name.strip().casefold()).encode("utf-8")
+    return hashlib.pbkdf2_hmac("sha256", passphrase.encode("utf-8"), salt, iterations).hex()
+
+# Append-only journal in SQLite (WAL mode). Entries are only ever inserted, so history
+# is never rewritten. Every insert also adds the entry's terms to an inverted index
+# keyed by (user, term, entry), and entries are indexed by (user, month). A search or
+# a month view therefore reads only the index ranges it needs, however large the
+# journal grows. `user` is always a journal_key, never a plain name.
+class Journal:
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        # One Journal may serve callers on several threads (the app shares one across
+        # sessions); every use of the connection holds self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, user TEXT NOT NULL, "
+                "created_at TEXT NOT NULL, month TEXT NOT NULL, challenge TEXT NOT NULL, "
+                "reflection TEXT NOT NULL, achievement TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS entries_by_month ON entries (user, month, id)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings (user TEXT NOT NULL, term TEXT NOT NULL, "
+                "entry_id INTEGER NOT NULL, PRIMARY KEY (user, term, entry_id)) WITHOUT ROWID"
+            )
+
+    # Function to append an entry and index its terms in one transaction; returns its ID
+    def add_entry(self, user, challenge="", reflection="", achievement="", created_at=None):
+        created_at = created_at or time.strftime("%Y-%m-%d %H:%M:%S")
+        terms = tokenize(" ".join([challenge, reflection, achievement]))
+        with self.lock:
+            with self.conn:
+                entry_id = self.conn.execute(
+                    "INSERT INTO entries (user, created_at, month, challenge, reflection, achievement) VALUES (?, ?, ?, ?, ?, ?)",
+                    (user, created_at, created_at[:7], challenge, reflection, achievement),
+                ).lastrowid
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO postings (user, term, entry_id) VALUES (?, ?, ?)",
+                    ((user, term, entry_id) for term in terms),
+                )
+        return entry_id
+
+    # Function to find a user's newest entries containing every query term. Each term
+    # also matches longer words it starts, so "learn" finds "learning".
+    def search(self, user, query, limit=SEARCH_LIMIT):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        clauses = []
+        params = []
+        for term in terms:
+            end = prefix_end(term)
+            clauses.append("SELECT entry_id FROM postings WHERE user = ? AND term >= ?" + (" AND term < ?" if end is not None else ""))
+            params += [user, term] + ([end] if end is not None else [])
+        matches = " INTERSECT ".join(clauses)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM entries WHERE id IN ({matches}) ORDER BY id DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Function to list a user's entries for a month ("YYYY-MM", default this month), newest first
+    def month_entries(self, user, month=None):
+        month = month or time.strftime("%Y-%m")
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM entries WHERE user = ? AND month = ? ORDER BY id DESC", (user, month)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Function to count a user's entries per month, newest month first
+    def month_counts(self, user):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT month, COUNT(*) FROM entries WHERE user = ? GROUP BY month ORDER BY month DESC", (user,)
+            ).fetchall()
+        return [(month, count) for month, count in rows]
+
+    def close(self):
+        self.conn.close()
+
+# Function to print a journal entry as text
+def format_entry(entry):
+    lines = [entry["created_at"]]
+    for field in JOURNAL_FIELDS:
+        if entry[field]:
+            lines.append(f"  {field}: {entry[field]}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.growth_mindset", description="Print today's quote and responses to your entries.")
+    parser.add_argument("--challenge", help="a challenge you are facing")
+    parser.add_argument("--reflection", help="a reflection on your learning")
+    parser.add_argument("--achievement", help="something you have recently accomplished")
+    parser.add_argument("--user", help="journal owner, for --save, --search and --month; the passphrase is prompted for")
+    parser.add_argument("--save", action="store_true", help="append the entries to the journal")
+    parser.add_argument("--search", help="list journal entries containing these words")
+    parser.add_argument("--month", nargs="?", const="", help="list journal entries for a month (YYYY-MM, default this month)")
+    parser.add_argument("--journal", default=JOURNAL_FILE)
+    args = parser.parse_args(argv)
+
+    if (args.save or args.search or args.month is not None) and not args.user:
+        parser.error("--save, --search and --month need --user")
+
+    print(QUOTE)
+    if args.challenge:
+        print(challenge_message(args.challenge))
+    if args.reflection:
+        print(reflection_message(args.reflection))
+    if args.achievement:
+        print(achievement_message(args.achievement))
+
+    if not (args.save or args.search or args.month is not None):
+        return
+    user = journal_key(args.user, getpass.getpass("Journal passphrase: "))
+    journal = Journal(args.journal)
+    try:
+        if args.save and (args.challenge or args.reflection or args.achievement):
+            journal.add_entry(user, args.challenge or "", args.reflection or "", args.achievement or "")
+            print("Saved to your journal.")
+        if args.search:
+            for entry in journal.search(user, args.search):
+                print(format_entry(entry))
+        if args.month is not None:
+            for entry in journal.month_entries(user, args.month or None):
+                print(format_entry(entry))
+    finally:
+        journal.close()
+
+if __name__ == "__main__":
+    main()
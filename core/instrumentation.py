@@ -0,0 +1,83 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Per-rerun phase timings and memory estimates for the Streamlit apps. A PhaseTimer is
+# started on the thread that runs a rerun; code anywhere below it marks its work with
+# `with phase("kdf"):`. Outside a timed rerun (CLIs, pool workers) phase() does nothing.
+#
+# Nested phases are timed exclusively: a KDF inside a cipher call counts as KDF only,
+# so the phases of a rerun add up to its wall time.
+
+_active = threading.local()
+
+class PhaseTimer:
+    def __init__(self):
+        self.totals = {}
+        self.stack = []
+        self.started = time.perf_counter()
+        self.mark = self.started
+
+    # Function to charge the time since the last mark to the innermost open phase
+    def _charge(self, now):
+        if self.stack:
+            name = self.stack[-1]
+            self.totals[name] = self.totals.get(name, 0.0) + now - self.mark
+        self.mark = now
+
+    def enter(self, name):
+        self._charge(time.perf_counter())
+        self.stack.append(name)
+
+    def exit(self):
+        self._charge(time.perf_counter())
+        self.stack.pop()
+
+    # Function to report seconds per phase; time outside every phase goes to `rest`
+    def report(self, rest="other"):
+        now = time.perf_counter()
+        timings = dict(self.totals)
+        if self.stack:
+            timings[self.stack[-1]] = timings.get(self.stack[-1], 0.0) + now - self.mark
+        timings[rest] = max(0.0, (now - self.started) - sum(timings.values()))
+        timings["total"] = now - self.started
+        return timings
+
+# Function to start timing on the current thread; replaces any timer left by an earlier run
+def start_phase_timer():
+    timer = PhaseTimer()
+    _active.timer = timer
+    return timer
+
+# Function to stop timing on the current thread
+def stop_phase_timer():
+    _active.timer = None
+
+# Context manager to time a block as `name` under the current thread's timer
+@contextmanager
+def phase(name):
+    timer = getattr(_active, "timer", None)
+    if timer is None:
+        yield
+        return
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
+
+# Function to estimate the memory held by an object and everything it contains.
+# Objects reached twice are counted once.
+def approximate_size(obj, seen=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(key, seen) + approximate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    return size
@@ -0,0 +1,184 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import Counter, deque
+
+from core.breach_corpus import BREACH_CORPUS_FILE, open_breach_corpus
+from core.password_strength import MAX_SCORE, RULE_MESSAGES, analyze_password, evaluate_password, strength_label
+
+# Bulk password audit for password-strength-meter.py: scores a file of passwords with the
+# app's rules on a process pool. Lines are read and scored in chunks with a bounded
+# number of chunks in flight, and the per-row report is written as results arrive,
+# so memory does not grow with the size of the file.
+#
+#   python -m core.password_audit passwords.txt
+#   python -m core.password_audit export.txt --report audit.csv --workers 8
+
+AUDIT_WORKERS = os.cpu_count() or 1
+AUDIT_CHUNK_LINES = 10_000  # passwords sent to a worker in one task
+AUDIT_MAX_PENDING = 2  # chunks in flight per worker
+AUDIT_SAMPLE_ROWS = 1000  # per-row report rows kept by the app; the CLI writes them all
+REPORT_HEADER = ["line", "score", "entropy_bits", "strength", "failed_rules"]
+
+# Per-worker breach corpus, memory-mapped once the index exists
+_worker_corpus = None
+_worker_corpus_path = None
+
+def init_audit_worker(corpus_path):
+    global _worker_corpus, _worker_corpus_path
+    _worker_corpus_path = corpus_path
+    _worker_corpus = open_breach_corpus(corpus_path)
+
+# Function run in a worker: score a chunk of passwords. Returns the chunk's score
+# histogram, rule failure counts and entropy total, plus per-row results if asked for.
+def audit_chunk(passwords, with_rows):
+    global _worker_corpus
+    if _worker_corpus is None:
+        # The pool outlives the app's reruns, so an index built after it started is picked up here
+        _worker_corpus = open_breach_corpus(_worker_corpus_path)
+    histogram = Counter()
+    failures = Counter()
+    entropy_total = 0.0
+    rows = [] if with_rows else None
+    for password in passwords:
+        analysis = analyze_password(password, _worker_corpus)
+        score, failed = evaluate_password(analysis)
+        histogram[score] += 1
+        failures.update(failed)
+        entropy_total += analysis["entropy_bits"]
+        if with_rows:
+            rows.append((score, analysis["entropy_bits"], failed))
+    return histogram, failures, entropy_total, rows
+
+# Function to create the worker pool. Workers are spawned rather than forked, so none
+# inherits a copy of the caller's corpus map; each maps the index itself.
+def create_audit_pool(max_workers=AUDIT_WORKERS, corpus_path=BREACH_CORPUS_FILE):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_audit_worker,
+        initargs=(corpus_path,),
+    )
+
+# Function to split lines (str or bytes) into chunks of (line number, password).
+# Line endings are stripped; blank lines are skipped but still counted.
+def iter_password_chunks(lines, chunk_lines=AUDIT_CHUNK_LINES):
+    chunk = []
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        password = line.rstrip("\r\n")
+        if not password:
+            continue
+        chunk.append((line_number, password))
+        if len(chunk) >= chunk_lines:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Function to write the per-row results of one chunk to a CSV writer
+def write_report_rows(writer, chunk, rows, include_passwords):
+    for (line_number, password), (score, entropy_bits, failed) in zip(chunk, rows):
+        row = [line_number, int(score / MAX_SCORE * 100), entropy_bits, strength_label(score), ";".join(failed)]
+        if include_passwords:
+            row.append(password)
+        writer.writerow(row)
+
+# Function to audit every password in `lines` on the pool. Results come back in input
+# order; at most AUDIT_MAX_PENDING chunks per worker are queued at a time. When `report`
+# is a text file, a CSV row is written for every password, or for the first
+# `report_rows` only. `progress` is called with the number of passwords audited so far.
+# Returns the aggregate summary.
+def audit_passwords(lines, pool, workers=AUDIT_WORKERS, report=None, include_passwords=False,
+                    progress=None, chunk_lines=AUDIT_CHUNK_LINES, report_rows=None):
+    writer = None
+    if report is not None:
+        writer = csv.writer(report)
+        writer.writerow(REPORT_HEADER + (["password"] if include_passwords else []))
+
+    histogram = Counter()
+    failures = Counter()
+    entropy_total = 0.0
+    total = 0
+    pending = deque()
+    limit = float("inf") if report_rows is None else report_rows
+    requested = 0  # report rows asked of the workers so far
+    reported = 0
+
+    def collect():
+        nonlocal entropy_total, total, reported
+        chunk, future = pending.popleft()
+        chunk_histogram, chunk_failures, chunk_entropy, rows = future.result()
+        histogram.update(chunk_histogram)
+        failures.update(chunk_failures)
+        entropy_total += chunk_entropy
+        total += len(chunk)
+        if rows is not None:
+            keep = int(min(len(rows), limit - reported))
+            write_report_rows(writer, chunk[:keep], rows[:keep], include_passwords)
+            reported += keep
+        if progress is not None:
+            progress(total)
+
+    for chunk in iter_password_chunks(lines, chunk_lines):
+        if len(pending) >= workers * AUDIT_MAX_PENDING:
+            collect()
+        passwords = [password for _, password in chunk]
+        # Rows are only asked for until the report is full; the parent keeps only the
+        # line numbers it needs for the report
+        with_rows = writer is not None and requested < limit
+        requested += len(chunk) if with_rows else 0
+        pending.append((chunk if with_rows else passwords, pool.submit(audit_chunk, passwords, with_rows)))
+    while pending:
+        collect()
+
+    return {
+        "total": total,
+        "histogram": {score: histogram.get(score, 0) for score in range(MAX_SCORE + 1)},
+        "failures": failures.most_common(),
+        "mean_entropy": entropy_total / total if total else 0.0,
+    }
+
+# Function to print an audit summary as text
+def format_summary(summary):
+    total = max(summary["total"], 1)
+    lines = [f"Audited {summary['total']:,} passwords, mean entropy {summary['mean_entropy']:.1f} bits", "", "Score histogram:"]
+    for score, count in summary["histogram"].items():
+        bar = "#" * round(40 * count / total)
+        lines.append(f"  {int(score / MAX_SCORE * 100):>3}% {strength_label(score):<11} {count:>12,} {bar}")
+    lines += ["", "Most-failed rules:"]
+    for rule, count in summary["failures"]:
+        lines.append(f"  {count:>12,} ({count / total:6.1%})  {RULE_MESSAGES[rule].lstrip('❌ ')}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.password_audit", description="Audit a file of passwords, one per line.")
+    parser.add_argument("input", help="password file, or - for stdin")
+    parser.add_argument("--report", help="write a per-row CSV report to this path")
+    parser.add_argument("--include-passwords", action="store_true", help="add the passwords themselves to the report")
+    parser.add_argument("--workers", type=int, default=AUDIT_WORKERS)
+    parser.add_argument("--corpus", default=BREACH_CORPUS_FILE, help="breached-password index (used if it exists)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    report = open(args.report, "w", newline="", encoding="utf-8") if args.report else None
+    try:
+        with create_audit_pool(args.workers, args.corpus) as pool:
+            summary = audit_passwords(source, pool, args.workers, report, args.include_passwords)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if report is not None:
+            report.close()
+    elapsed = time.perf_counter() - start
+    print(format_summary(summary))
+    print(f"\n{elapsed:.1f}s, {summary['total'] / max(elapsed, 1e-9):,.0f} passwords/s on {args.workers} workers")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import math
+import string
+import sys
+
+from core.breach_corpus import BREACH_CORPUS_FILE, open_breach_corpus
+
+# Password scoring used by password-strength-meter.py.
+#
+#   python -m core.password_strength "Tr0ub4dor&3"
+#   python -m core.password_strength < passwords.txt
+
+COMMON_PASSWORDS = {
+    "password", "123456", "12345678", "qwerty", "abc123", 
+    "letmein", "monkey", "111111", "123123", "welcome"
+}
+
+# Character classes, as bit flags. SPECIAL is the set the strength rule asks for;
+# SYMBOL is any other printable ASCII punctuation or space.
+LOWER, UPPER, DIGIT, SPECIAL, SYMBOL, OTHER = 1, 2, 4, 8, 16, 32
+SPECIAL_CHARACTERS = '!@#$%^&*(),.?":{}|<>'
+# Guessing pool contributed by each class present in a password
+CLASS_POOL_SIZES = {LOWER: 26, UPPER: 26, DIGIT: 10, SPECIAL: len(SPECIAL_CHARACTERS), SYMBOL: 33 - len(SPECIAL_CHARACTERS), OTHER: 100}
+PATTERN_MIN_RUN = 3  # repeats, sequences and keyboard walks count from this many characters
+PATTERN_BITS = 1.0  # entropy of a character that only continues a pattern
+KEYBOARD_ROWS = ["`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./"]
+SHIFTED_ROWS = ["~!@#$%^&*()_+", "QWERTYUIOP{}|", 'ASDFGHJKL:"', "ZXCVBNM<>?"]
+
+# Function to build the per-character class table for printable ASCII
+def build_class_table():
+    table = {}
+    for char in string.printable[:-5]:  # digits, letters, punctuation and space
+        if char in string.ascii_lowercase:
+            table[char] = LOWER
+        elif char in string.ascii_uppercase:
+            table[char] = UPPER
+        elif char in string.digits:
+            table[char] = DIGIT
+        elif char in SPECIAL_CHARACTERS:
+            table[char] = SPECIAL
+        else:
+            table[char] = SYMBOL
+    return table
+
+# Function to build the set of horizontally adjacent key pairs, shifted or not
+def build_keyboard_neighbors():
+    neighbors = {}
+    for row in KEYBOARD_ROWS + SHIFTED_ROWS:
+        for left, right in zip(row, row[1:]):
+            neighbors.setdefault(left, set()).add(right)
+            neighbors.setdefault(right, set()).add(left)
+    return {char: frozenset(chars) for char, chars in neighbors.items()}
+
+# Built once at import, so analysing a password is one pass of dict lookups
+CHAR_CLASSES = build_class_table()
+KEYBOARD_NEIGHBORS = build_keyboard_neighbors()
+NO_NEIGHBORS = frozenset()
+ALPHANUMERIC = LOWER | UPPER | DIGIT
+
+# Function to analyse a password in a single pass over its characters: the classes used,
+# characters that only continue a repeat, sequence or keyboard walk, and an entropy estimate.
+# The first character of a run carries full entropy; the rest of a run of at least
+# PATTERN_MIN_RUN characters is predictable and counts PATTERN_BITS each.
+# When a breach corpus is given, the password is also looked up in it.
+def analyze_password(password, corpus=None):
+    classes = 0
+    repeat_chars = sequence_chars = walk_chars = 0
+    repeat_run = sequence_run = walk_run = 1
+    patterned = 0  # characters covered by any pattern, each counted once
+    covered_upto = 0
+    previous = None
+    previous_code = step = 0
+    char_classes = CHAR_CLASSES
+    neighbors = NO_NEIGHBORS
+    for index, char in enumerate(password):
+        char_class = char_classes.get(char)
+        if char_class is None:
+            # \d in the original rule also matched non-ASCII digits
+            char_class = DIGIT if char.isdigit() else OTHER
+        classes |= char_class
+        code = ord(char)
+        delta = code - previous_code
+
+        if previous is not None:
+            repeat_run = repeat_run + 1 if delta == 0 else 1
+            if (delta == 1 or delta == -1) and char_class & ALPHANUMERIC:
+                sequence_run = sequence_run + 1 if sequence_run == 1 or delta == step else 2
+            else:
+                sequence_run = 1
+            walk_run = walk_run + 1 if char in neighbors else 1
+
+            if repeat_run >= PATTERN_MIN_RUN or sequence_run >= PATTERN_MIN_RUN or walk_run >= PATTERN_MIN_RUN:
+                if repeat_run >= PATTERN_MIN_RUN:
+                    repeat_chars += PATTERN_MIN_RUN - 1 if repeat_run == PATTERN_MIN_RUN else 1
+                if sequence_run >= PATTERN_MIN_RUN:
+                    sequence_chars += PATTERN_MIN_RUN - 1 if sequence_run == PATTERN_MIN_RUN else 1
+                if walk_run >= PATTERN_MIN_RUN:
+                    walk_chars += PATTERN_MIN_RUN - 1 if walk_run == PATTERN_MIN_RUN else 1
+                # The run covers every character after its first, up to this one
+                start = max(index - max(repeat_run, sequence_run, walk_run) + 2, covered_upto + 1)
+                patterned += index - start + 1
+                covered_upto = index
+
+        previous = char
+        previous_code = code
+        step = delta
+        neighbors = KEYBOARD_NEIGHBORS.get(char, NO_NEIGHBORS)
+
+    pool_size = sum(size for char_class, size in CLASS_POOL_SIZES.items() if classes & char_class)
+    common = password.lower() in COMMON_PASSWORDS
+    breached = corpus is not None and password in corpus
+    if common or breached:
+        # A listed password is found by trying the list, whatever its characters
+        entropy_bits = math.log2(max(len(corpus) if breached else len(COMMON_PASSWORDS), 1))
+    elif pool_size:
+        entropy_bits = (len(password) - patterned) * math.log2(pool_size) + patterned * PATTERN_BITS
+    else:
+        entropy_bits = 0.0
+
+    return {
+        "length": len(password),
+        "lower": bool(classes & LOWER),
+        "upper": bool(classes & UPPER),
+        "digit": bool(classes & DIGIT),
+        "special": bool(classes & SPECIAL),
+        "pool_size": pool_size,
+        "repeat_chars": repeat_chars,
+        "sequence_chars": sequence_chars,
+        "walk_chars": walk_chars,
+        "common": common,
+        "breached": breached,
+        "entropy_bits": round(entropy_bits, 1),
+    }
+
+# Suggestion shown for each failed rule, in display order
+RULE_MESSAGES = {
+    "length": "❌ Password should be at least 8 characters long.",
+    "case": "❌ Include both uppercase and lowercase letters.",
+    "digit": "❌ Add at least one number (0-9).",
+    "special": "❌ Include at least one special character (!@#$%^&*(),.?\":{}|<>).",
+    "repeat": "❌ Avoid repeating the same character (e.g. aaa).",
+    "sequence": "❌ Avoid sequences like abc or 123.",
+    "walk": "❌ Avoid keyboard patterns like qwerty or asdf.",
+    "common": "❌ This is a very common password. Please choose something more unique.",
+    "breached": "❌ This password has appeared in a data breach. Please choose a different one.",
+}
+MAX_SCORE = 6
+STRENGTH_LEVELS = [(6, "Very Strong"), (4, "Moderate"), (0, "Weak")]
+
+# Function to score an analysis against the strength rules; returns (score, failed rule keys).
+# Kept free of message formatting so bulk audits only pay for the checks.
+def evaluate_password(analysis):
+    failed = []
+    score = 0
+
+    if analysis["length"] >= 8:
+        score += 1
+        if analysis["length"] >= 12:
+            score += 1
+    else:
+        failed.append("length")
+ 
+    if analysis["upper"] and analysis["lower"]:
+        score += 1
+    else:
+        failed.append("case")
+ 
+    if analysis["digit"]:
+        score += 1
+    else:
+        failed.append("digit")
+
+    if analysis["special"]:
+        score += 1
+    else:
+        failed.append("special")
+
+    if analysis["repeat_chars"]:
+        failed.append("repeat")
+    if analysis["sequence_chars"]:
+        failed.append("sequence")
+    if analysis["walk_chars"]:
+        failed.append("walk")
+ 
+    if analysis["common"]:
+        failed.append("common")
+        score = 0  
+    elif analysis["breached"]:
+        failed.append("breached")
+        score = 0
+
+    return score, failed
+
+# Function to name the strength level of a score
+def strength_label(score):
+    return next(label for threshold, label in STRENGTH_LEVELS if score >= threshold)
+
+# Function to score a password against the strength rules. A precomputed analysis
+# can be passed in so the characters are only scanned once.
+def check_password_strength(password, analysis=None, corpus=None):
+    if analysis is None:
+        analysis = analyze_password(password, corpus)
+    score, failed = evaluate_password(analysis)
+    feedback = [RULE_MESSAGES[rule] for rule in failed]
+
+    if score >= 6:
+        strength_message = "✅ Very Strong Password!"
+    elif score >= 4:
+        strength_message = "⚠️ Moderate Password - Consider adding more security features."
+    else:
+        strength_message = "❌ Weak Password - Improve it using the suggestions above."
+
+    strength_percent = int((score / MAX_SCORE) * 100)
+    
+    return strength_message, feedback, strength_percent
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.password_strength", description="Score password strength.")
+    parser.add_argument("passwords", nargs="*", help="passwords to check (default: one per line from stdin)")
+    parser.add_argument("--feedback", action="store_true", help="print the suggestions for each password")
+    parser.add_argument("--corpus", default=BREACH_CORPUS_FILE, help="breached-password index built with core.breach_corpus (used if it exists)")
+    args = parser.parse_args(argv)
+
+    corpus = open_breach_corpus(args.corpus)
+
+    passwords = args.passwords or (line.rstrip("\r\n") for line in sys.stdin)
+    for password in passwords:
+        analysis = analyze_password(password, corpus)
+        strength_message, suggestions, strength_percent = check_password_strength(password, analysis)
+        # Tab-separated so the output can be piped into other tools
+        print(f"{strength_percent}\t{analysis['entropy_bits']:.1f}\t{strength_message}")
+        if args.feedback:
+            for suggestion in suggestions:
+                print(f"\t{suggestion}")
+
+if __name__ == "__main__":
+    main()
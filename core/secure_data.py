@@ -0,0 +1,929 @@
+import argparse
+import base64
+import csv
+import getpass
+import hashlib
+import hmac
+import importlib.util
+import io
+import json
+import os
+import random
+import sqlite3
+import string
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from core.instrumentation import phase
+from core.secure_data_fallback import caesar_encrypt, caesar_decrypt  # Caesar cipher fallback when cryptography is not available
+
+# Encryption, key derivation and storage for secure-data.py. The cryptography package is
+# imported inside the functions that use it, so storage lookups and the CLI start quickly.
+#
+#   python -m core.secure_data encrypt "some secret" --store
+#   python -m core.secure_data decrypt 3f9a0c1e2b4d5a6f
+#   python -m core.secure_data encrypt-file report.pdf --store
+#   python -m core.secure_data batch encrypt records.csv results.csv
+#   python -m core.secure_data rotate --new-passkey "new secret"
+#   python -m core.secure_data compact
+#
+# The passkey is read from --passkey, the SECURE_DATA_PASSKEY environment variable or a prompt.
+
+CRYPTOGRAPHY_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+
+KDF_ITERATIONS = 100000
+KDF_SALT = b'salt_'  # fixed salt of records written before envelope encryption
+KEK_SALT_SIZE = 16
+ENVELOPE_PREFIX = "sde1"  # version tag that starts every wrapped data key
+ROTATE_BATCH_SIZE = 500  # records re-keyed per store transaction
+KEY_CACHE_MAX_ENTRIES = 128
+KEY_CACHE_TTL = 300  # seconds
+STORAGE_BACKEND = os.environ.get("SECURE_DATA_BACKEND", "sqlite")  # "sqlite" or "json"
+JSON_DATA_FILE = "encrypted_data.json"
+SQLITE_DATA_FILE = "encrypted_data.db"
+COMPACT_EVERY = 1000  # writes between WAL checkpoints
+SESSION_RECORD_TTL = 3600  # seconds a session's unsaved records are kept after its last rerun
+SESSION_EXPIRE_EVERY = 60  # seconds between sweeps for idle sessions
+RATE_LIMIT_FILE = os.environ.get("SECURE_DATA_RATE_LIMITS", "rate_limits.db")
+CLIENT_ADDRESS_HEADER = os.environ.get("SECURE_DATA_CLIENT_HEADER", "")  # e.g. X-Forwarded-For, only when set by a trusted proxy
+ATTEMPT_COST = 1  # tokens taken for every decryption attempt, before any key derivation; given back to the client on success
+FAILURE_COST = 2  # tokens charged on top for a wrong passkey
+RATE_LIMITS = {  # bucket kind: (capacity in tokens, tokens refilled per second)
+    "client": (3 * (ATTEMPT_COST + FAILURE_COST), 3 * (ATTEMPT_COST + FAILURE_COST) / 30),  # 3 failures, refilled over 30 s
+    "record": (10, 10 / 60),  # 10 attempts a minute on one record, from all clients together
+}
+RATE_LIMIT_SWEEP_EVERY = 300  # seconds between deletes of buckets that have refilled
+RECORD_ID_LENGTH = 16  # hex characters of the content hash used as record ID
+STREAM_DIR = "encrypted_files"
+STREAM_CHUNK_SIZE = 64 * 1024  # plaintext bytes per authenticated chunk
+STREAM_MAGIC = b"SDS1"
+STREAM_HEADER = struct.Struct(">4sI16s")  # magic, chunk size, file salt
+STREAM_TAG_SIZE = 16
+
+# Process-wide derived key cache. Module state lives as long as the process, so the cache
+# is shared by every Streamlit session and kept across reruns.
+# Entries are keyed by an HMAC of the passkey under a random per-process secret,
+# so raw passkeys are never stored and the cache keys are useless outside this process.
+_key_cache = {
+    "entries": OrderedDict(),  # {cache_id: (derived_key, created_at)}
+    "wrap_salts": OrderedDict(),  # {cache_id: KEK salt used to wrap new data keys}
+    "secret": os.urandom(32),
+    "lock": threading.Lock(),
+    "hits": 0,
+    "misses": 0,
+}
+
+# Function to generate a pseudo-random string for the ID
+def generate_id(length=10):
+    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+
+# Function to derive a short, stable record ID from the ciphertext. Only the payload of
+# an envelope token is hashed, so rewrapping its data key keeps the ID.
+def make_record_id(encrypted_text):
+    envelope = split_envelope(encrypted_text)
+    payload = envelope[1] if envelope else encrypted_text
+    return hashlib.sha256(payload.encode()).hexdigest()[:RECORD_ID_LENGTH]
+
+# Function to turn user input (a record ID or a full encrypted token) into a record ID
+def resolve_record_id(text):
+    text = text.strip()
+    if len(text) == RECORD_ID_LENGTH and all(c in string.hexdigits for c in text):
+        return text.lower()
+    return make_record_id(text)
+
+# Function to hash passkey
+def hash_passkey(passkey):
+    return hashlib.sha256(passkey.encode()).hexdigest()
+
+# Function to encrypt data under a new data key; the token carries the wrapped key
+def encrypt_data(text, passkey, iterations=KDF_ITERATIONS):
+    with phase("cipher"):
+        if CRYPTOGRAPHY_AVAILABLE:
+            from cryptography.fernet import Fernet
+            data_key, wrapped_key = new_data_key(passkey, iterations)
+            cipher = Fernet(data_key)
+            return f"{wrapped_key}.{cipher.encrypt(text.encode()).decode()}"
+        else:
+            # Fallback to Caesar cipher with a shift derived from the passkey
+            shift = sum(ord(c) for c in passkey) % 26
+            encrypted = caesar_encrypt(text, shift)
+            # Create a unique ID for this encrypted text
+            unique_id = generate_id()
+            return f"{unique_id}:{encrypted}"
+
+# Function to decrypt data
+def decrypt_data(encrypted_text, passkey):
+    with phase("cipher"):
+        try:
+            if CRYPTOGRAPHY_AVAILABLE:
+                from cryptography.fernet import Fernet
+                envelope = split_envelope(encrypted_text)
+                if envelope is not None:
+                    wrapped_key, payload = envelope
+                    cipher = Fernet(unwrap_data_key(wrapped_key, passkey_kek(passkey)))
+                    return cipher.decrypt(payload.encode()).decode()
+                # Written before envelope encryption: encrypted straight under the passkey key
+                key = generate_key_from_passkey(passkey)
+                cipher = Fernet(key)
+                return cipher.decrypt(encrypted_text.encode()).decode()
+            else:
+                # Parse the unique ID and encrypted text
+                if ":" not in encrypted_text:
+                    return None
+                unique_id, encrypted = encrypted_text.split(":", 1)
+                shift = sum(ord(c) for c in passkey) % 26
+                return caesar_decrypt(encrypted, shift)
+        except Exception:
+            return None
+
+# Function to derive a key from the passkey with PBKDF2 (uncached)
+def derive_key_from_passkey(passkey, salt=KDF_SALT, iterations=KDF_ITERATIONS):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(passkey.encode()))
+
+# Function to get the per-process cache ID of a passkey under a salt and KDF cost
+def key_cache_id(passkey, salt, iterations):
+    return hmac.new(_key_cache["secret"], b"%s\x00%d\x00%s" % (salt, iterations, passkey.encode()), hashlib.sha256).digest()
+
+# Function to generate key from passkey (only if cryptography is available)
+def generate_key_from_passkey(passkey, salt=KDF_SALT, iterations=KDF_ITERATIONS):
+    if not CRYPTOGRAPHY_AVAILABLE:
+        return None
+
+    cache = _key_cache
+    cache_id = key_cache_id(passkey, salt, iterations)
+    now = time.time()
+
+    with cache["lock"]:
+        entry = cache["entries"].get(cache_id)
+        if entry is not None and now - entry[1] < KEY_CACHE_TTL:
+            cache["entries"].move_to_end(cache_id)
+            cache["hits"] += 1
+            return entry[0]
+        cache["entries"].pop(cache_id, None)
+        cache["misses"] += 1
+
+    # Derive outside the lock so other sessions are not blocked on the KDF
+    with phase("kdf"):
+        key = derive_key_from_passkey(passkey, salt, iterations)
+
+    with cache["lock"]:
+        cache["entries"][cache_id] = (key, now)
+        cache["entries"].move_to_end(cache_id)
+        while len(cache["entries"]) > KEY_CACHE_MAX_ENTRIES:
+            cache["entries"].popitem(last=False)
+    return key
+
+# Function to get key cache statistics
+def get_key_cache_stats():
+    cache = _key_cache
+    with cache["lock"]:
+        return {"size": len(cache["entries"]), "hits": cache["hits"], "misses": cache["misses"]}
+
+# Envelope encryption. Every record is encrypted under its own random data key, and only
+# that key is encrypted ("wrapped") under a key-encryption key (KEK) derived from the
+# passkey. A wrapped key reads "sde1.<iterations>.<KEK salt>.<Fernet token of the data key>",
+# so it names the KDF settings that unwrap it. Changing a passkey or the KDF cost rewraps
+# this short string and leaves the payload, however large, untouched.
+#
+# A KEK salt is drawn once per passkey and process, not per record, so wrapping many
+# records costs one key derivation, and unwrapping costs one per distinct salt.
+
+# Function to get the KEK salt for wrapping new data keys under a passkey
+def wrapping_salt(passkey, iterations=KDF_ITERATIONS):
+    cache = _key_cache
+    cache_id = key_cache_id(passkey, b"wrap", iterations)
+    with cache["lock"]:
+        salt = cache["wrap_salts"].get(cache_id)
+        if salt is None:
+            salt = os.urandom(KEK_SALT_SIZE)
+            cache["wrap_salts"][cache_id] = salt
+            while len(cache["wrap_salts"]) > KEY_CACHE_MAX_ENTRIES:
+                cache["wrap_salts"].popitem(last=False)
+        cache["wrap_salts"].move_to_end(cache_id)
+    return salt
+
+# Function to wrap a data key under a KEK
+def wrap_data_key(data_key, kek, salt, iterations):
+    from cryptography.fernet import Fernet
+    encoded_salt = base64.urlsafe_b64encode(salt).decode().rstrip("=")
+    return ".".join([ENVELOPE_PREFIX, str(iterations), encoded_salt, Fernet(kek).encrypt(data_key).decode()])
+
+# Function to split a wrapped key into (iterations, KEK salt, wrapped token); raises ValueError if malformed
+def parse_wrapped_key(wrapped_key):
+    prefix, iterations, encoded_salt, token = wrapped_key.split(".")
+    if prefix != ENVELOPE_PREFIX:
+        raise ValueError("Not a wrapped data key")
+    return int(iterations), base64.urlsafe_b64decode(encoded_salt + "=" * (-len(encoded_salt) % 4)), token
+
+# Function to unwrap a data key; `get_kek(salt, iterations)` supplies the KEK. Raises on a wrong passkey
+def unwrap_data_key(wrapped_key, get_kek):
+    from cryptography.fernet import Fernet
+    iterations, salt, token = parse_wrapped_key(wrapped_key)
+    return Fernet(get_kek(salt, iterations)).decrypt(token.encode())
+
+# Function to get the KEK lookup of a passkey for unwrap_data_key, backed by the key cache
+def passkey_kek(passkey):
+    return lambda salt, iterations: generate_key_from_passkey(passkey, salt, iterations)
+
+# Function to draw a random data key; returns (data key, data key wrapped under the passkey)
+def new_data_key(passkey, iterations=KDF_ITERATIONS):
+    from cryptography.fernet import Fernet
+    data_key = Fernet.generate_key()
+    return data_key, rewrap_data_key(data_key, passkey, iterations)
+
+# Function to wrap an existing data key under a passkey
+def rewrap_data_key(data_key, passkey, iterations=KDF_ITERATIONS):
+    salt = wrapping_salt(passkey, iterations)
+    return wrap_data_key(data_key, generate_key_from_passkey(passkey, salt, iterations), salt, iterations)
+
+# Function to split an envelope token into (wrapped key, payload); None for older tokens
+def split_envelope(encrypted_text):
+    if not encrypted_text.startswith(ENVELOPE_PREFIX + "."):
+        return None
+    wrapped_key, _, payload = encrypted_text.rpartition(".")
+    return wrapped_key, payload
+
+# Streaming encryption for large payloads. Data is split into fixed-size chunks,
+# each sealed with AES-GCM under a per-file key (HKDF of the file's data key and a random
+# file salt). The chunk index and a final-chunk flag are bound in as associated data,
+# so chunks cannot be reordered or truncated, and any chunk can be decrypted on its own.
+# The wrapped data key is kept in the file's record; files written before envelope
+# encryption have none and use the passkey key instead.
+
+# Function to get the data key of a file from its record's wrapped key
+def file_data_key(passkey, wrapped_key=None):
+    if wrapped_key is None:
+        return generate_key_from_passkey(passkey)
+    return unwrap_data_key(wrapped_key, passkey_kek(passkey))
+
+# Function to derive the per-file stream key
+def derive_stream_key(data_key, file_salt):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    master_key = base64.urlsafe_b64decode(data_key)
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=file_salt, info=b"secure-data stream v1").derive(master_key)
+
+# Function to build the associated data for one chunk
+def stream_chunk_aad(header, index, final):
+    return header + struct.pack(">QB", index, 1 if final else 0)
+
+# Function to read a file-like object in fixed-size chunks
+def iter_file_chunks(fileobj, chunk_size=STREAM_CHUNK_SIZE):
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+# Function to encrypt a stream of plaintext chunks under a data key; yields the header, then sealed chunks
+def encrypt_stream(chunks, data_key, chunk_size=STREAM_CHUNK_SIZE):
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    file_salt = os.urandom(16)
+    header = STREAM_HEADER.pack(STREAM_MAGIC, chunk_size, file_salt)
+    aead = AESGCM(derive_stream_key(data_key, file_salt))
+    yield header
+
+    # Look one chunk ahead so the last chunk can be flagged as final
+    index = 0
+    pending = b""
+    for chunk in chunks:
+        if pending:
+            yield aead.encrypt(struct.pack(">4xQ", index), pending, stream_chunk_aad(header, index, False))
+            index += 1
+        pending = chunk
+    yield aead.encrypt(struct.pack(">4xQ", index), pending, stream_chunk_aad(header, index, True))
+
+# Function to encrypt plaintext chunks into a temporary file; returns (path, content digest, plaintext size, chunk count)
+def write_stream_file(chunks, data_key):
+    os.makedirs(STREAM_DIR, exist_ok=True)
+    tmp_path = os.path.join(STREAM_DIR, f".{generate_id()}.tmp")
+    digest = hashlib.sha256()
+    size = 0
+    chunk_count = 0
+
+    def counted(chunks):
+        nonlocal size
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+
+    try:
+        with open(tmp_path, "wb") as f:
+            for i, block in enumerate(encrypt_stream(counted(chunks), data_key)):
+                digest.update(block)
+                f.write(block)
+                chunk_count = i
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size, chunk_count
+
+# Function to encrypt a file-like object to disk under a new data key;
+# returns (record_id, path, plaintext size, chunk count, wrapped data key)
+def write_encrypted_file(fileobj, passkey):
+    with phase("cipher"):
+        data_key, wrapped_key = new_data_key(passkey)
+        tmp_path, digest, size, chunk_count = write_stream_file(iter_file_chunks(fileobj), data_key)
+        record_id = digest[:RECORD_ID_LENGTH]
+        path = os.path.join(STREAM_DIR, f"{record_id}.bin")
+        os.replace(tmp_path, path)
+        return record_id, path, size, chunk_count, wrapped_key
+
+# Function to read the header and chunk layout of an encrypted file
+def read_stream_header(f):
+    header = f.read(STREAM_HEADER.size)
+    magic, chunk_size, file_salt = STREAM_HEADER.unpack(header)
+    if magic != STREAM_MAGIC:
+        raise ValueError("Not a secure-data stream file")
+    f.seek(0, os.SEEK_END)
+    body_size = f.tell() - STREAM_HEADER.size
+    sealed_size = chunk_size + STREAM_TAG_SIZE
+    chunk_count = max(1, -(-body_size // sealed_size))
+    return header, chunk_size, file_salt, chunk_count
+
+# Function to decrypt a range of chunks from an encrypted file; yields plaintext chunks
+def decrypt_stream(path, passkey, start=0, stop=None, wrapped_key=None):
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    with open(path, "rb") as f:
+        header, chunk_size, file_salt, chunk_count = read_stream_header(f)
+        aead = AESGCM(derive_stream_key(file_data_key(passkey, wrapped_key), file_salt))
+        sealed_size = chunk_size + STREAM_TAG_SIZE
+        stop = chunk_count if stop is None else min(stop, chunk_count)
+        f.seek(STREAM_HEADER.size + start * sealed_size)
+        for index in range(start, stop):
+            sealed = f.read(sealed_size)
+            final = index == chunk_count - 1
+            yield aead.decrypt(struct.pack(">4xQ", index), sealed, stream_chunk_aad(header, index, final))
+
+# Function to decrypt a single chunk of an encrypted file; returns None on failure
+def decrypt_chunk(path, passkey, index, wrapped_key=None):
+    try:
+        with phase("cipher"):
+            return next(decrypt_stream(path, passkey, index, index + 1, wrapped_key), None)
+    except Exception:
+        return None
+
+# Legacy storage backend: the whole store is kept in one JSON file.
+# Every write rewrites the file, so it is only suitable for small stores.
+class JsonStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, 'r') as f:
+                self.data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.data = {}
+        # Records written before record IDs were keyed by their full ciphertext; rekey them once
+        legacy_keys = [key for key, record in self.data.items() if key == record.get("encrypted_text")]
+        if legacy_keys:
+            for key in legacy_keys:
+                record = self.data.pop(key)
+                self.data[make_record_id(record["encrypted_text"])] = record
+            self.write()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def write(self):
+        # Write to a temp file and swap it in so a crash never leaves a half-written store
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def put(self, key, record):
+        with self.lock:
+            self.data[key] = record
+            self.write()
+
+    def put_many(self, items):
+        with self.lock:
+            self.data.update(items)
+            self.write()
+
+    def count(self):
+        return len(self.data)
+
+    def items(self):
+        return list(self.data.items())
+
+    # Function to list up to `limit` records with keys after `after`, in key order
+    def scan(self, after="", limit=ROTATE_BATCH_SIZE):
+        with self.lock:
+            keys = sorted(key for key in self.data if key > after)[:limit]
+            return [(key, self.data[key]) for key in keys]
+
+    def compact(self):
+        pass
+
+# SQLite storage backend in WAL mode. Records are indexed by their primary key,
+# so inserts and lookups touch only one row instead of the whole store.
+class SqliteStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.writes = 0
+        # Streamlit runs sessions on different threads, so the connection is shared under a lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self.conn.commit()
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM records WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, record):
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO records (key, data) VALUES (?, ?)",
+                    (key, json.dumps(record)),
+                )
+            self.count_writes(1)
+
+    def put_many(self, items):
+        rows = [(key, json.dumps(record)) for key, record in items]
+        with self.lock:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO records (key, data) VALUES (?, ?)", rows)
+            self.count_writes(len(rows))
+
+    # Function to checkpoint the WAL each time another COMPACT_EVERY rows have been written.
+    # Called with the lock held.
+    def count_writes(self, rows):
+        before = self.writes
+        self.writes += rows
+        if self.writes // COMPACT_EVERY > before // COMPACT_EVERY:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def items(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT key, data FROM records").fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+    # Function to list up to `limit` records with keys after `after`, in key order
+    def scan(self, after="", limit=ROTATE_BATCH_SIZE):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT key, data FROM records WHERE key > ? ORDER BY key LIMIT ?", (after, limit)
+            ).fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+    def compact(self):
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+
+# Function to import records from the legacy JSON file into a fresh SQLite store
+def migrate_json_store(store, json_path=JSON_DATA_FILE):
+    if store.count() > 0 or not os.path.exists(json_path):
+        return 0
+    legacy = JsonStore(json_path)  # rekeys records still keyed by their ciphertext
+    store.put_many(legacy.items())
+    os.replace(json_path, json_path + ".migrated")
+    return legacy.count()
+
+# Function to open the storage backend, migrating legacy JSON data into a new SQLite store
+def open_store(backend=STORAGE_BACKEND):
+    if backend == "json":
+        return JsonStore(JSON_DATA_FILE)
+    store = SqliteStore(SQLITE_DATA_FILE)
+    migrate_json_store(store)
+    return store
+
+# Records that were not saved to the persistent store, shared by every session in the
+# process. Each record is held once; a session only keeps the set of record IDs it
+# stored, and can read back only those, so unsaved records stay private to their session.
+# Sessions idle for longer than `ttl` are dropped with the records no other session holds,
+# and so are the encrypted files of those records.
+class SessionRecordCache:
+    def __init__(self, ttl=SESSION_RECORD_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.records = {}  # {record_id: record}
+        self.owners = {}  # {record_id: number of sessions holding it}
+        self.sessions = {}  # {session_id: [set of record IDs, last seen]}
+        self.last_expired = time.time()
+
+    def _view(self, session_id, now):
+        view = self.sessions.get(session_id)
+        if view is None:
+            view = self.sessions[session_id] = [set(), now]
+        view[1] = now
+        return view
+
+    def put_many(self, session_id, items):
+        with self.lock:
+            ids = self._view(session_id, time.time())[0]
+            for key, record in items:
+                self.records[key] = record
+                if key not in ids:
+                    ids.add(key)
+                    self.owners[key] = self.owners.get(key, 0) + 1
+
+    def put(self, session_id, key, record):
+        self.put_many(session_id, [(key, record)])
+
+    def get(self, session_id, key):
+        with self.lock:
+            view = self.sessions.get(session_id)
+            if view is None or key not in view[0]:
+                return None
+            return self.records.get(key)
+
+    def count(self, session_id):
+        with self.lock:
+            view = self.sessions.get(session_id)
+            return len(view[0]) if view else 0
+
+    # Function to list a session's records, e.g. to measure its memory
+    def session_records(self, session_id):
+        with self.lock:
+            view = self.sessions.get(session_id)
+            return [self.records[key] for key in view[0]] if view else []
+
+    # Function to mark a session as active; sweeps idle sessions at most every SESSION_EXPIRE_EVERY seconds
+    def touch(self, session_id):
+        now = time.time()
+        dropped = []
+        with self.lock:
+            self._view(session_id, now)
+            if now - self.last_expired < SESSION_EXPIRE_EVERY:
+                return
+            self.last_expired = now
+            for idle_id in [sid for sid, (_, seen) in self.sessions.items() if now - seen > self.ttl]:
+                for key in self.sessions.pop(idle_id)[0]:
+                    self.owners[key] -= 1
+                    if not self.owners[key]:
+                        del self.owners[key]
+                        dropped.append(self.records.pop(key))
+        # An unsaved file record is the only reference to its file, so the file goes with it
+        for record in dropped:
+            if "file" in record and os.path.exists(record["file"]):
+                os.remove(record["file"])
+
+    def stats(self):
+        with self.lock:
+            return {"sessions": len(self.sessions), "records": len(self.records)}
+
+# Token-bucket rate limiter shared by every session and server process, in SQLite.
+# A bucket is one row keyed by "kind:key", holding its tokens at the last update; the
+# refill since then is computed on read, so a check is a primary-key lookup and update.
+# Rows are only kept while a bucket is below capacity: each records when it will be
+# full again, and rows past that time are swept, so idle clients cost nothing.
+class RateLimiter:
+    def __init__(self, path=RATE_LIMIT_FILE, limits=RATE_LIMITS):
+        self.path = path
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.last_swept = 0.0
+        # Transactions are opened by hand with BEGIN IMMEDIATE, so concurrent processes
+        # read and update a bucket one at a time
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated REAL NOT NULL, full_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS buckets_by_full_at ON buckets (full_at)")
+
+    # Function to read the current token levels of (kind, key) buckets; call inside a transaction
+    def _levels(self, buckets, now):
+        levels = []
+        for kind, key in buckets:
+            capacity, rate = self.limits[kind]
+            row = self.conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (f"{kind}:{key}",)).fetchone()
+            levels.append(capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate))
+        return levels
+
+    def _store(self, kind, key, tokens, now):
+        capacity, rate = self.limits[kind]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)",
+            (f"{kind}:{key}", tokens, now, now + (capacity - tokens) / rate),
+        )
+
+    # Function to run `body(now)` in one write transaction under the process lock
+    def _transaction(self, body):
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = body(now)
+                if now - self.last_swept >= RATE_LIMIT_SWEEP_EVERY:
+                    self.conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                    self.last_swept = now
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        return result
+
+    # Function to take `cost` tokens from every bucket, or from none if any is short.
+    # Returns 0 when the request may go ahead, else the seconds until it would be allowed.
+    def acquire(self, buckets, cost=ATTEMPT_COST):
+        def body(now):
+            levels = self._levels(buckets, now)
+            waits = [(cost - level) / self.limits[kind][1] for (kind, _), level in zip(buckets, levels) if level < cost]
+            if waits:
+                return max(waits)
+            for (kind, key), level in zip(buckets, levels):
+                self._store(kind, key, level - cost, now)
+            return 0.0
+        return self._transaction(body)
+
+    # Function to charge extra tokens after a failure; buckets do not go below empty
+    def penalize(self, buckets, cost=FAILURE_COST):
+        def body(now):
+            for (kind, key), level in zip(buckets, self._levels(buckets, now)):
+                self._store(kind, key, max(0.0, level - cost), now)
+        self._transaction(body)
+
+    # Function to give back tokens taken by acquire, e.g. after a successful attempt;
+    # buckets do not go above capacity
+    def refund(self, buckets, cost=ATTEMPT_COST):
+        def body(now):
+            for (kind, key), level in zip(buckets, self._levels(buckets, now)):
+                self._store(kind, key, min(self.limits[kind][0], level + cost), now)
+        self._transaction(body)
+
+    # Function to get the seconds until `cost` tokens are available, without taking any
+    def retry_after(self, buckets, cost=ATTEMPT_COST):
+        with self.lock:
+            levels = self._levels(buckets, time.time())
+        waits = [(cost - level) / self.limits[kind][1] for (kind, _), level in zip(buckets, levels) if level < cost]
+        return max(waits, default=0.0)
+
+    # Function to get the current token level of one bucket
+    def tokens(self, kind, key):
+        with self.lock:
+            return self._levels([(kind, key)], time.time())[0]
+
+    def close(self):
+        self.conn.close()
+
+# Function to parse batch records from CSV text with `data,passkey` columns
+def read_batch_rows(csv_text):
+    reader = csv.DictReader(io.StringIO(csv_text))
+    return [(row["data"], row["passkey"]) for row in reader if row.get("data") and row.get("passkey")]
+
+# Function to build a stored record with the hashed passkey and the current time
+def new_record(passkey, **fields):
+    return {**fields, "passkey": hash_passkey(passkey), "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+# Key rotation. A record is re-keyed from its passkey to a new passkey and KDF cost.
+# Envelope records only have their data key rewrapped, a few hundred bytes whatever the
+# payload size. Records written before envelope encryption are re-encrypted once under a
+# fresh data key, so the old passkey no longer opens them; their record IDs are kept.
+
+# Function to check whether a record is already an envelope record of `passkey_hash` at `iterations`
+def record_is_current(record, passkey_hash, iterations):
+    wrapped_key = record.get("wrapped_key")
+    if "encrypted_text" in record:
+        envelope = split_envelope(record["encrypted_text"])
+        wrapped_key = envelope[0] if envelope else None
+    return wrapped_key is not None and record.get("passkey") == passkey_hash and parse_wrapped_key(wrapped_key)[0] == iterations
+
+# Function to re-key one record; returns (updated record, replaced file to delete or None).
+# Raises ValueError if `passkey` does not open the record.
+def rotate_record(record, passkey, new_passkey, iterations=KDF_ITERATIONS):
+    from cryptography.exceptions import InvalidTag
+    from cryptography.fernet import InvalidToken
+    record = dict(record, passkey=hash_passkey(new_passkey))
+    replaced_file = None
+    try:
+        if "encrypted_text" in record:
+            envelope = split_envelope(record["encrypted_text"])
+            if envelope is not None:
+                wrapped_key, payload = envelope
+                data_key = unwrap_data_key(wrapped_key, passkey_kek(passkey))
+                record["encrypted_text"] = f"{rewrap_data_key(data_key, new_passkey, iterations)}.{payload}"
+            else:
+                text = decrypt_data(record["encrypted_text"], passkey)
+                if text is None:
+                    raise ValueError("Incorrect passkey")
+                record["encrypted_text"] = encrypt_data(text, new_passkey, iterations)
+        elif "wrapped_key" in record:
+            data_key = unwrap_data_key(record["wrapped_key"], passkey_kek(passkey))
+            record["wrapped_key"] = rewrap_data_key(data_key, new_passkey, iterations)
+        else:
+            data_key, record["wrapped_key"] = new_data_key(new_passkey, iterations)
+            tmp_path, digest, _, _ = write_stream_file(decrypt_stream(record["file"], passkey), data_key)
+            path = os.path.join(STREAM_DIR, f"{digest[:RECORD_ID_LENGTH]}.bin")
+            os.replace(tmp_path, path)
+            replaced_file, record["file"] = record["file"], path
+    except (InvalidTag, InvalidToken):
+        raise ValueError("Incorrect passkey")
+    return record, replaced_file
+
+# Function to re-key every stored record of `passkey` to `new_passkey` at `iterations`,
+# in transactions of `batch_size` records; yields (scanned, re-keyed, failed) counts after
+# each batch. Records already current are skipped, so an interrupted rotation resumes
+# where it stopped when run again. Replaced files are deleted once their batch is saved.
+def rotate_store(store, passkey, new_passkey, iterations=KDF_ITERATIONS, batch_size=ROTATE_BATCH_SIZE):
+    old_hash, new_hash = hash_passkey(passkey), hash_passkey(new_passkey)
+    scanned = rotated = failed = 0
+    after = ""
+    while True:
+        page = store.scan(after, batch_size)
+        if not page:
+            break
+        after = page[-1][0]
+        updates = []
+        replaced_files = []
+        for key, record in page:
+            scanned += 1
+            if record.get("passkey") not in (old_hash, new_hash) or record_is_current(record, new_hash, iterations):
+                continue
+            # Records an earlier run already moved to the new passkey are opened with it
+            record_passkey = passkey if record["passkey"] == old_hash else new_passkey
+            try:
+                record, replaced_file = rotate_record(record, record_passkey, new_passkey, iterations)
+            except ValueError:
+                failed += 1
+                continue
+            updates.append((key, record))
+            if replaced_file is not None:
+                replaced_files.append(replaced_file)
+        if updates:
+            store.put_many(updates)
+        for path in replaced_files:
+            if os.path.exists(path):
+                os.remove(path)
+        rotated += len(updates)
+        yield scanned, rotated, failed
+
+# Command line entry point. Records are only read from and written to the persistent store;
+# the in-memory session records of the web app are not visible here.
+
+# Function to read the passkey for a command
+def read_passkey(args):
+    return args.passkey or os.environ.get("SECURE_DATA_PASSKEY") or getpass.getpass("Passkey: ")
+
+# Function to run a key rotation over the persistent store, reporting progress per batch
+def run_rotate_command(args):
+    passkey = read_passkey(args)
+    new_passkey = args.new_passkey or os.environ.get("SECURE_DATA_NEW_PASSKEY") or passkey
+    scanned = rotated = failed = 0
+    store = open_store()
+    for scanned, rotated, failed in rotate_store(store, passkey, new_passkey, args.iterations):
+        print(f"Scanned {scanned} records, re-keyed {rotated}", file=sys.stderr)
+    print(f"Re-keyed {rotated} records")
+    if rotated:
+        # Every re-keyed row was rewritten; reclaim the space of the old versions
+        store.compact()
+    if failed:
+        sys.exit(f"{failed} records could not be opened with the passkey")
+
+# Function to look up a stored record whose passkey matches; exits on a mismatch
+def load_verified_record(store, text, passkey):
+    record = store.get(resolve_record_id(text))
+    if record is not None and not hmac.compare_digest(record["passkey"], hash_passkey(passkey)):
+        sys.exit("Incorrect passkey")
+    return record
+
+# Function to run a CSV batch on a process pool and write the results CSV
+def run_batch_command(args):
+    from core.secure_data_batch import create_process_pool, run_batch
+
+    with open(args.input, newline="") as f:
+        rows = read_batch_rows(f.read())
+    store = open_store() if args.store or args.mode == "decrypt" else None
+    items = rows
+    if args.mode == "decrypt":
+        # Record IDs are replaced by their ciphertext; anything else is decrypted as a token
+        items = []
+        for data, passkey in rows:
+            record = store.get(resolve_record_id(data))
+            items.append((record["encrypted_text"] if record and "encrypted_text" in record else data, passkey))
+
+    results = [None] * len(rows)
+    with create_process_pool(args.workers) as pool:
+        for group in run_batch(pool, items, args.mode, KDF_ITERATIONS):
+            for index, result in group:
+                results[index] = result
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        if args.mode == "encrypt":
+            writer.writerow(["record_id", "encrypted_text"])
+            new_records = {}
+            for (data, passkey), encrypted_text in zip(rows, results):
+                record_id = make_record_id(encrypted_text)
+                new_records[record_id] = new_record(passkey, encrypted_text=encrypted_text)
+                writer.writerow([record_id, encrypted_text])
+            if store is not None:
+                store.put_many(new_records.items())
+        else:
+            writer.writerow(["data", "decrypted_text"])
+            for (data, passkey), decrypted_text in zip(rows, results):
+                writer.writerow([data, decrypted_text if decrypted_text is not None else ""])
+    failed = sum(1 for result in results if result is None)
+    print(f"{args.mode.capitalize()}ed {len(rows) - failed} of {len(rows)} records", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.secure_data", description="Encrypt and decrypt data with a passkey.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    encrypt = commands.add_parser("encrypt", help="encrypt text (default: read from stdin)")
+    encrypt.add_argument("text", nargs="?")
+    decrypt = commands.add_parser("decrypt", help="decrypt a record ID or encrypted token")
+    decrypt.add_argument("token")
+    encrypt_file = commands.add_parser("encrypt-file", help="encrypt a file in chunks into the encrypted files directory")
+    encrypt_file.add_argument("path")
+    decrypt_file = commands.add_parser("decrypt-file", help="decrypt a stored file record to a path")
+    decrypt_file.add_argument("record_id")
+    decrypt_file.add_argument("output")
+    rotate = commands.add_parser("rotate", help="re-key stored records to a new passkey or KDF cost, rewrapping only their data keys")
+    rotate.add_argument("--new-passkey", help="new passkey (default: $SECURE_DATA_NEW_PASSKEY, else keep the passkey)")
+    rotate.add_argument("--iterations", type=int, default=KDF_ITERATIONS, help="PBKDF2 iterations of the new key-encryption key")
+    commands.add_parser("compact", help="checkpoint the write-ahead log and reclaim free space in the store")
+    for command in (encrypt, decrypt, encrypt_file, decrypt_file, rotate):
+        command.add_argument("--passkey", help="passkey (default: $SECURE_DATA_PASSKEY or a prompt)")
+    for command in (encrypt, encrypt_file):
+        command.add_argument("--store", action="store_true", help="save the record to the persistent store")
+    batch = commands.add_parser("batch", help="encrypt or decrypt `data,passkey` CSV records on a process pool")
+    batch.add_argument("mode", choices=["encrypt", "decrypt"])
+    batch.add_argument("input")
+    batch.add_argument("output")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    batch.add_argument("--store", action="store_true", help="save encrypted records to the persistent store")
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        if not CRYPTOGRAPHY_AVAILABLE:
+            sys.exit("Batch mode requires the 'cryptography' package")
+        run_batch_command(args)
+    elif args.command == "rotate":
+        if not CRYPTOGRAPHY_AVAILABLE:
+            sys.exit("Key rotation requires the 'cryptography' package")
+        run_rotate_command(args)
+    elif args.command == "compact":
+        store = open_store()
+        store.compact()
+        print(f"Compacted store with {store.count()} records")
+    elif args.command == "encrypt":
+        passkey = read_passkey(args)
+        text = args.text if args.text is not None else sys.stdin.read()
+        encrypted_text = encrypt_data(text, passkey)
+        record_id = make_record_id(encrypted_text)
+        if args.store:
+            open_store().put(record_id, new_record(passkey, encrypted_text=encrypted_text))
+        print(record_id)
+        print(encrypted_text)
+    elif args.command == "decrypt":
+        passkey = read_passkey(args)
+        record = load_verified_record(open_store(), args.token, passkey)
+        decrypted_text = decrypt_data(record["encrypted_text"] if record else args.token.strip(), passkey)
+        if decrypted_text is None:
+            sys.exit("Decryption failed")
+        print(decrypted_text)
+    elif args.command == "encrypt-file":
+        if not CRYPTOGRAPHY_AVAILABLE:
+            sys.exit("File encryption requires the 'cryptography' package")
+        passkey = read_passkey(args)
+        with open(args.path, "rb") as f:
+            record_id, path, size, chunk_count, wrapped_key = write_encrypted_file(f, passkey)
+        if args.store:
+            record = new_record(passkey, file=path, name=os.path.basename(args.path), size=size, chunks=chunk_count, wrapped_key=wrapped_key)
+            open_store().put(record_id, record)
+        print(record_id)
+    else:
+        passkey = read_passkey(args)
+        record = load_verified_record(open_store(), args.record_id, passkey)
+        if record is None or "file" not in record:
+            sys.exit("No such file record")
+        try:
+            with open(args.output, "wb") as out:
+                for chunk in decrypt_stream(record["file"], passkey, wrapped_key=record.get("wrapped_key")):
+                    out.write(chunk)
+        except Exception:
+            os.remove(args.output)
+            sys.exit("Decryption failed")
+
+if __name__ == "__main__":
+    main()
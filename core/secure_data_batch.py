@@ -0,0 +1,47 @@
+import os
+
+# Batch encryption helpers for secure-data.py. This module is kept free of Streamlit
+# so it can be imported by the worker processes of the pool; cryptography is only
+# imported inside the workers.
+
+BATCH_WORKERS = os.cpu_count() or 1
+BATCH_GROUP_SIZE = 64  # items sent to a worker in one task
+
+# Function run in a worker: encrypt or decrypt a group of items sharing one passkey.
+# Each worker has its own key cache in core.secure_data, so a passkey's key-encryption
+# key is derived once per worker and every item only gets a fresh data key.
+def process_group(mode, passkey, indexed_texts, iterations):
+    from core.secure_data import decrypt_data, encrypt_data
+    results = []
+    for index, text in indexed_texts:
+        if mode == "encrypt":
+            results.append((index, encrypt_data(text, passkey, iterations)))
+        else:
+            results.append((index, decrypt_data(text, passkey)))
+    return results
+
+# Function to create the worker pool; spawn avoids forking Streamlit's server threads
+def create_process_pool(max_workers=BATCH_WORKERS):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+# Function to split (text, passkey) items into per-passkey groups of indexed texts
+def group_items(items, group_size=BATCH_GROUP_SIZE):
+    by_passkey = {}
+    for index, (text, passkey) in enumerate(items):
+        by_passkey.setdefault(passkey, []).append((index, text))
+    for passkey, indexed_texts in by_passkey.items():
+        for start in range(0, len(indexed_texts), group_size):
+            yield passkey, indexed_texts[start:start + group_size]
+
+# Function to run a batch across the pool; yields lists of (index, result) as groups complete.
+# Items sharing a passkey are grouped so each worker derives that key only once.
+def run_batch(pool, items, mode, iterations, group_size=BATCH_GROUP_SIZE):
+    from concurrent.futures import as_completed
+    futures = [
+        pool.submit(process_group, mode, passkey, indexed_texts, iterations)
+        for passkey, indexed_texts in group_items(items, group_size)
+    ]
+    for future in as_completed(futures):
+        yield future.result()
@@ -0,0 +1,26 @@
+import string
+from functools import lru_cache
+
+# Caesar cipher used by secure-data.py when the cryptography package is not available.
+# Kept free of Streamlit so it can be imported by benchmarks and batch jobs.
+
+# Function to build the str and bytes translation tables for a shift (26 shifts, cached)
+@lru_cache(maxsize=None)
+def caesar_tables(shift):
+    shift %= 26
+    lower = string.ascii_lowercase
+    upper = string.ascii_uppercase
+    source = lower + upper
+    target = lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift]
+    return str.maketrans(source, target), bytes.maketrans(source.encode(), target.encode())
+
+# Simple Caesar cipher over ASCII letters, in one linear pass.
+# str input returns str; bytes and bytearray are translated directly without decoding.
+def caesar_encrypt(text, shift):
+    text_table, bytes_table = caesar_tables(shift)
+    if isinstance(text, str):
+        return text.translate(text_table)
+    return text.translate(bytes_table)
+
+def caesar_decrypt(text, shift):
+    return caesar_encrypt(text, -shift)
@@ -1,74 +1,542 @@
 import streamlit as st
 import pandas as pd
 import os
+import hashlib
+import threading
+import tempfile
+import time
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from collections import OrderedDict
 from io import BytesIO
+from core.data_sweeper import (
+    ALL_SHEETS, COLUMNAR_EXTENSIONS, COMPRESSION_OPTIONS, FILTER_OPERATORS, OUTPUT_FORMATS, PARQUET_AVAILABLE,
+    SUPPORTED_EXTENSIONS, aggregate_for_chart, apply_cleaning_step, benchmark_formats, coerce_filter_value,
+    guess_category_columns, iter_chunks, read_columnar, read_columnar_schema, read_tabular, write_frame, write_streaming_output,
+)
+from core.data_sweeper_excel import excel_sheet_names, iter_excel_chunks
+from core.column_profile import merge_profiles, profile_chunks, profile_frame
  
 st.set_page_config(page_title="Data Sweeper", layout="wide")
- 
-st.title("Data Sweeper")  
-st.write("Transform your files between CSV and Excel formats with built-in data cleaning and visualization.")
- 
-uploaded_files = st.file_uploader("Upload your files (CSV or Excel):", type=["csv", "xlsx"], accept_multiple_files=True)
 
- 
-if uploaded_files:
-    for file in uploaded_files:
-        file_extension = os.path.splitext(file.name)[-1].lower()
- 
+PARSE_CACHE_BUDGET = 512 * 1024 * 1024  # bytes of parsed frames kept in memory
+SPILL_DIR = ".data_sweeper_cache"
+SPILL_BUDGET = PARSE_CACHE_BUDGET  # bytes of Parquet spills kept on disk
+OUTPUT_PREFIX = "output-"  # converted files written to SPILL_DIR for download
+OUTPUT_MAX_AGE = 24 * 3600  # seconds before an output left by an ended session is swept
+LARGE_FILE_THRESHOLD = 200 * 1024 * 1024  # uploads above this default to streaming mode
+INGEST_WORKERS = min(8, os.cpu_count() or 1)
+SNIFF_ROWS = 1000  # rows sampled to guess column types before the full read
+DEFAULT_POINT_BUDGET = 1000  # points sent to the browser per chart
+CHART_TYPES = ["Bar (binned means)", "Line (LTTB)", "Histogram"]
+PROFILE_CACHE_ENTRIES = 256  # column profiles kept in memory; each is a few KB per column
+
+# Process-wide LRU cache of parsed and cleaned frames, keyed by file content hash,
+# parse options and the cleaning steps applied, bounded by PARSE_CACHE_BUDGET
+@st.cache_resource
+def get_frame_cache():
+    return {"frames": OrderedDict(), "size": 0, "lock": threading.Lock()}
+
+def frame_cache_get(key):
+    cache = get_frame_cache()
+    with cache["lock"]:
+        entry = cache["frames"].get(key)
+        if entry is None:
+            return None
+        cache["frames"].move_to_end(key)
+        return entry[0]
+
+def frame_cache_put(key, df):
+    cache = get_frame_cache()
+    size = int(df.memory_usage(deep=True).sum())
+    with cache["lock"]:
+        old = cache["frames"].pop(key, None)
+        if old is not None:
+            cache["size"] -= old[1]
+        cache["frames"][key] = (df, size)
+        cache["size"] += size
+        while cache["size"] > PARSE_CACHE_BUDGET and len(cache["frames"]) > 1:
+            _, (_, evicted_size) = cache["frames"].popitem(last=False)
+            cache["size"] -= evicted_size
+
+# Process-wide LRU cache of column profiles, keyed like the frame cache. A profile is
+# computed once per file content and reused by every session and rerun.
+@st.cache_resource
+def get_profile_cache():
+    return {"profiles": OrderedDict(), "lock": threading.Lock()}
+
+def load_profile(key, compute):
+    cache = get_profile_cache()
+    with cache["lock"]:
+        profile = cache["profiles"].get(key)
+        if profile is not None:
+            cache["profiles"].move_to_end(key)
+            return profile
+    profile = compute()
+    with cache["lock"]:
+        cache["profiles"][key] = profile
+        while len(cache["profiles"]) > PROFILE_CACHE_ENTRIES:
+            cache["profiles"].popitem(last=False)
+    return profile
+
+# Content hash of an upload, computed once per uploaded file
+def file_content_hash(file):
+    hashes = st.session_state.setdefault("file_hashes", {})
+    if file.file_id not in hashes:
+        hashes[file.file_id] = hashlib.sha256(file.getvalue()).hexdigest()
+    return hashes[file.file_id]
+
+def parse_cache_key(content_hash, file_extension, parse_options):
+    return (content_hash, file_extension, tuple(sorted(parse_options.items())))
+
+def spill_path(key):
+    return os.path.join(SPILL_DIR, hashlib.sha256(repr(key).encode()).hexdigest() + ".parquet")
+
+# Delete the least recently used Parquet spills until they fit in SPILL_BUDGET.
+# A spill's modification time is bumped on every read, so it orders them by last use.
+def trim_spills():
+    spills = []
+    for entry in os.scandir(SPILL_DIR):
+        if entry.name.endswith(".parquet"):
+            stat = entry.stat()
+            spills.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in spills)
+    for _, size, path in sorted(spills):
+        if total <= SPILL_BUDGET:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # trimmed by another session
+        total -= size
+
+# Header and first SNIFF_ROWS rows of a CSV upload or Excel sheet, read once per file
+def sniff_sample(file, file_extension, sheet_name=None):
+    samples = st.session_state.setdefault("schema_samples", {})
+    sample_key = (file_content_hash(file), sheet_name)
+    if sample_key not in samples:
+        file.seek(0)
         if file_extension == ".csv":
-            df = pd.read_csv(file)   
-        elif file_extension == ".xlsx":
-            df = pd.read_excel(file)  
+            samples[sample_key] = pd.read_csv(file, nrows=SNIFF_ROWS)
         else:
-            st.error(f"Unsupported file type: {file_extension}")
-            continue
- 
-        st.write(f"**📄 File Name:** {file.name}")
-        st.write(f"**📏 File Size:** {file.size / 1024:.2f} KB")  
+            samples[sample_key] = next(iter_excel_chunks(file, sheet_name, chunk_size=SNIFF_ROWS), pd.DataFrame())
+    return samples[sample_key]
 
-        st.write("🔍 Preview of the Uploaded File:")
-        st.dataframe(df.head())   
- 
-        st.subheader("🛠️ Data Cleaning Options")
-        if st.checkbox(f"Clean Data for {file.name}"):
-            col1, col2 = st.columns(2)   
+# Sheet names of an Excel upload, read once per file
+def sheet_names(file):
+    names = st.session_state.setdefault("sheet_names", {})
+    content_hash = file_content_hash(file)
+    if content_hash not in names:
+        names[content_hash] = excel_sheet_names(file)
+    return names[content_hash]
+
+# Parse an upload, reusing the in-memory cache or the on-disk Parquet spill when possible
+def load_file(file, file_extension, parse_options):
+    key = parse_cache_key(file_content_hash(file), file_extension, parse_options) + ((),)
+    df = frame_cache_get(key)
+    if df is not None:
+        return df
+
+    if file_extension in COLUMNAR_EXTENSIONS:
+        # Already columnar: reading is as cheap as the spill would be
+        df = read_columnar(file, file_extension, parse_options)
+        frame_cache_put(key, df)
+        return df
+
+    path = spill_path(key)
+    df = None
+    if PARQUET_AVAILABLE and os.path.exists(path):
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # trimmed since the check; parse again
+    if df is None:
+        df = read_tabular(file, file_extension, parse_options)
+        if PARQUET_AVAILABLE:
+            try:
+                os.makedirs(SPILL_DIR, exist_ok=True)
+                df.to_parquet(path + ".tmp", index=False)
+                os.replace(path + ".tmp", path)
+                trim_spills()
+            except Exception:
+                # Columns with mixed types cannot be written as Parquet; keep the frame in memory only
+                if os.path.exists(path + ".tmp"):
+                    os.remove(path + ".tmp")
+    frame_cache_put(key, df)
+    return df
+
+# Apply cleaning steps on top of the parsed frame, starting from the longest cached prefix
+def load_cleaned_file(file, file_extension, parse_options, steps):
+    base_key = parse_cache_key(file_content_hash(file), file_extension, parse_options)
+    for done in range(len(steps), 0, -1):
+        df = frame_cache_get(base_key + (tuple(steps[:done]),))
+        if df is not None:
+            break
+    else:
+        done = 0
+        df = load_file(file, file_extension, parse_options)
+
+    for i in range(done, len(steps)):
+        df = apply_cleaning_step(df, steps[i])
+        frame_cache_put(base_key + (tuple(steps[:i + 1]),), df)
+    return df
+
+def read_output_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+# Delete outputs left behind by sessions that ended, once per server process. Only old
+# files are removed, since another server process may still be serving newer ones.
+@st.cache_resource
+def sweep_stale_outputs():
+    if not os.path.isdir(SPILL_DIR):
+        return
+    cutoff = time.time() - OUTPUT_MAX_AGE
+    for entry in os.scandir(SPILL_DIR):
+        if entry.name.startswith(OUTPUT_PREFIX) and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+# Keep one output file per session and slot: a new output deletes the one it replaces
+def replace_output(slot, path):
+    outputs = st.session_state.setdefault("output_files", {})
+    previous = outputs.get(slot)
+    if previous is not None and previous != path and os.path.exists(previous):
+        os.remove(previous)
+    outputs[slot] = path
+    return path
+
+# Run the selected passes over an upload and write the result to a temporary file
+def process_streaming(file, file_extension, sheet_name, usecols, dedupe, fillna, conversion_type, progress=None):
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    suffix = ".csv" if conversion_type == "CSV" else ".xlsx"
+    fd, path = tempfile.mkstemp(prefix=OUTPUT_PREFIX, suffix=suffix, dir=SPILL_DIR)
+    os.close(fd)
+    names = sheet_names(file) if sheet_name == ALL_SHEETS else None
+    return write_streaming_output(file, file_extension, path, conversion_type, sheet_name, usecols, dedupe, fillna, progress, names)
+
+# Aggregated chart data, cached with the frames under the data and column choice
+def load_chart_data(df, data_key, chart_type, chart_columns, budget):
+    key = ("chart", data_key, chart_type, chart_columns, budget)
+    chart_data = frame_cache_get(key)
+    if chart_data is None:
+        chart_data = aggregate_for_chart(df, chart_type, chart_columns, budget)
+        frame_cache_put(key, chart_data)
+    return chart_data
+
+# Column profile of a streamed upload, gathered in one pass over its chunks; all sheets are profiled together
+def load_streaming_profile(file, file_extension, sheet_name):
+    def compute():
+        names = sheet_names(file) if sheet_name == ALL_SHEETS else [sheet_name]
+        profiles = []
+        for name in names:
+            file.seek(0)
+            profiles.append(profile_chunks(iter_chunks(file, file_extension, name)))
+        return merge_profiles(profiles)
+    return load_profile(("profile", file_content_hash(file), file_extension, sheet_name), compute)
+
+# Show a profile, limited to the selected columns
+def render_profile(profile, columns=None):
+    report = profile.to_frame()
+    if columns is not None:
+        report = report[report["Column"].isin([str(column) for column in columns])]
+    st.dataframe(report, hide_index=True)
+    st.caption(f"{profile.rows:,} rows. Distinct counts and quantiles are estimates.")
+
+# Parse and clean a file on a pool thread, attached to the session's script context
+def load_in_thread(ctx, file, file_extension, parse_options, steps):
+    add_script_run_ctx(threading.current_thread(), ctx)
+    return load_cleaned_file(file, file_extension, parse_options, steps)
+
+# Read options for CSV and Excel uploads: columns to load and automatic dtype downcasting
+def render_tabular_read_options(file, file_extension):
+    parse_options = {}
+    with st.expander(f"⚙️ Read Options for {file.name}"):
+        if file_extension == ".xlsx" and len(sheet_names(file)) > 1:
+            parse_options["sheet_name"] = st.selectbox(f"Sheet to read from {file.name}", sheet_names(file), key=f"sheet_{file.file_id}")
+        sample = sniff_sample(file, file_extension, parse_options.get("sheet_name"))
+        columns = st.multiselect(f"Columns to read from {file.name}", list(sample.columns), default=list(sample.columns), key=f"read_columns_{file.file_id}_{parse_options.get('sheet_name')}")
+        optimize = st.checkbox(f"Optimize dtypes for {file.name}", value=True, key=f"optimize_dtypes_{file.file_id}")
+
+    if len(columns) < len(sample.columns):
+        parse_options["usecols"] = tuple(columns)
+    if optimize:
+        category_columns = [col for col in guess_category_columns(sample) if col in columns]
+        if category_columns:
+            parse_options["dtype"] = tuple((col, "category") for col in category_columns)
+        parse_options["downcast"] = True
+    return parse_options
+
+# Per-column memory of the loaded frame against the same columns at default dtypes,
+# estimated from the sniffed sample
+def memory_report(df, sample):
+    rows = []
+    for col in df.columns:
+        used = int(df[col].memory_usage(index=False, deep=True))
+        default = None
+        if col in sample.columns and len(sample):
+            default = int(sample[col].memory_usage(index=False, deep=True) / len(sample) * len(df))
+        rows.append({
+            "Column": col,
+            "Dtype": str(df[col].dtype),
+            "Memory (KB)": round(used / 1024, 1),
+            "Default Dtype (KB, est.)": round(default / 1024, 1) if default is not None else None,
+        })
+    return pd.DataFrame(rows, columns=["Column", "Dtype", "Memory (KB)", "Default Dtype (KB, est.)"])
+
+# Read options for Parquet and Feather uploads: projected columns and row filters
+def render_columnar_read_options(file, file_extension):
+    schema = read_columnar_schema(file, file_extension)
+    with st.expander(f"⚙️ Read Options for {file.name}"):
+        columns = st.multiselect(f"Columns to read from {file.name}", schema.names, default=schema.names, key=f"read_columns_{file.file_id}")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            filter_column = st.selectbox("Filter column", ["(none)"] + schema.names, key=f"filter_column_{file.file_id}")
+        with col2:
+            filter_op = st.selectbox("Operator", list(FILTER_OPERATORS), key=f"filter_op_{file.file_id}")
+        with col3:
+            filter_value = st.text_input("Value", key=f"filter_value_{file.file_id}")
+
+    parse_options = {}
+    if len(columns) < len(schema.names):
+        parse_options["columns"] = tuple(columns)
+    if filter_column != "(none)" and filter_value:
+        try:
+            parse_options["filters"] = ((filter_column, filter_op, coerce_filter_value(schema, filter_column, filter_value)),)
+        except ValueError:
+            st.error(f"Filter value {filter_value!r} does not match the type of {filter_column}")
+    return parse_options
+
+# Write every entry straight into a ZIP file on disk, one member at a time
+def build_zip(entries):
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    fd, zip_path = tempfile.mkstemp(prefix=OUTPUT_PREFIX, suffix=".zip", dir=SPILL_DIR)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for arcname, write in entries:
+                with archive.open(arcname, "w", force_zip64=True) as member:
+                    write(member)
+    except BaseException:
+        os.remove(zip_path)
+        raise
+    return zip_path
+
+def render_streaming_section(file, file_extension):
+    st.write(f"**📄 File Name:** {file.name}")
+    st.write(f"**📏 File Size:** {file.size / 1024:.2f} KB")
+
+    sheet_name = None
+    if file_extension == ".xlsx":
+        names = sheet_names(file)
+        sheet_name = st.selectbox(f"Sheet to convert from {file.name}", names + [ALL_SHEETS] if len(names) > 1 else names, key=f"stream_sheet_{file.file_id}")
+
+    preview = sniff_sample(file, file_extension, None if sheet_name == ALL_SHEETS else sheet_name).head()
+    st.write("🔍 Preview of the Uploaded File:")
+    st.dataframe(preview)
+
+    st.subheader("🛠️ Data Cleaning Options")
+    col1, col2 = st.columns(2)
+    with col1:
+        dedupe = st.checkbox(f"Remove Duplicates from {file.name}", key=f"stream_dedupe_{file.file_id}")
+    with col2:
+        fillna = st.checkbox(f"Fill Missing Values for {file.name}", key=f"stream_fillna_{file.file_id}")
+
+    columns = None
+    if sheet_name != ALL_SHEETS:
+        st.subheader("🎯 Select Columns to Convert")
+        columns = st.multiselect(f"Choose Columns for {file.name}", preview.columns, default=preview.columns)
+
+    if st.checkbox(f"Show Column Profile for {file.name}", key=f"stream_profile_{file.file_id}"):
+        with st.spinner("Profiling in chunks..."):
+            render_profile(load_streaming_profile(file, file_extension, sheet_name), columns)
+
+    st.subheader("🔄 Conversion Options")
+    # Several sheets can only be kept apart in an Excel output
+    conversion_type = st.radio(f"Convert {file.name} to:", ["Excel"] if sheet_name == ALL_SHEETS else ["CSV", "Excel"], key=file.name)
+    extension, mime_type = OUTPUT_FORMATS[conversion_type]
+    if st.button(f"Convert {file.name}"):
+        progress_bar = st.progress(0.0, text="Processing in chunks...")
+        output_path = replace_output(("stream", file.file_id), process_streaming(
+            file, file_extension, sheet_name, columns, dedupe, fillna, conversion_type,
+            progress=lambda fraction: progress_bar.progress(fraction, text="Processing in chunks..."),
+        ))
+        progress_bar.progress(1.0, text="Done!")
+        st.download_button(
+            label=f"⬇️ Download {file.name} as {conversion_type}",
+            data=lambda path=output_path: read_output_file(path),
+            file_name=file.name.replace(file_extension, extension),
+            mime=mime_type,
+            on_click="ignore"
+        )
+
+    def write(out):
+        path = process_streaming(file, file_extension, sheet_name, columns, dedupe, fillna, conversion_type)
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, out)
+        os.remove(path)
+
+    profile = lambda: load_streaming_profile(file, file_extension, sheet_name)
+    return (file.name.replace(file_extension, extension), write), profile
+
+def render_file_section(file, file_extension, df, steps, parse_options):
+    st.write(f"**📄 File Name:** {file.name}")
+    st.write(f"**📏 File Size:** {file.size / 1024:.2f} KB")  
+
+    st.write("🔍 Preview of the Uploaded File:")
+    st.dataframe(df.head())   
+
+    if file_extension not in COLUMNAR_EXTENSIONS:
+        with st.expander(f"🧮 Memory Usage for {file.name}"):
+            report = memory_report(df, sniff_sample(file, file_extension, parse_options.get("sheet_name")))
+            used = report["Memory (KB)"].sum()
+            default = report["Default Dtype (KB, est.)"].sum()
+            st.write(f"**{used:,.1f} KB** loaded, about **{default:,.1f} KB** at default dtypes")
+            st.dataframe(report, hide_index=True)
+
+    st.subheader("🛠️ Data Cleaning Options")
+    if st.checkbox(f"Clean Data for {file.name}"):
+        col1, col2 = st.columns(2)   
+        with col1:
+            if st.button(f"Remove Duplicates from {file.name}"):
+                if "dedupe" not in steps:
+                    steps.append("dedupe")
+                df = load_cleaned_file(file, file_extension, parse_options, steps)
+                st.write("Duplicates Removed!")
+        with col2:
+            if st.button(f"Fill Missing Values for {file.name}"):
+                if "fillna" not in steps:
+                    steps.append("fillna")
+                df = load_cleaned_file(file, file_extension, parse_options, steps)
+                st.write("Missing Values in Numeric Columns Filled with Column Means!")
+
+    profile_key = ("profile", file_content_hash(file), tuple(sorted(parse_options.items())), tuple(steps))
+    profile = lambda loaded=df: load_profile(profile_key, lambda: profile_frame(loaded))
+
+    st.subheader("🎯 Select Columns to Convert")
+    columns = st.multiselect(f"Choose Columns for {file.name}", df.columns, default=df.columns)
+    df = df[columns]   
+    data_key = (file_content_hash(file), tuple(sorted(parse_options.items())), tuple(steps), tuple(columns))
+
+    if st.checkbox(f"Show Column Profile for {file.name}"):
+        render_profile(profile(), columns)
+    
+    st.subheader("📊 Data Visualization")
+    if st.checkbox(f"Show Visualization for {file.name}"):
+        numeric_cols = list(df.select_dtypes(include='number').columns)
+        if not numeric_cols:
+            st.info("No numeric columns to visualize.")
+        else:
+            col1, col2, col3 = st.columns(3)
             with col1:
-                if st.button(f"Remove Duplicates from {file.name}"):
-                    df.drop_duplicates(inplace=True)
-                    st.write("Duplicates Removed!")
+                chart_type = st.selectbox(f"Chart type for {file.name}", CHART_TYPES, key=f"chart_type_{file.file_id}")
             with col2:
-                if st.button(f"Fill Missing Values for {file.name}"):
-                    numeric_cols = df.select_dtypes(include=['number']).columns
-                    df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].mean())
-                    st.write("Missing Values in Numeric Columns Filled with Column Means!")
+                chart_columns = st.multiselect(f"Chart columns for {file.name}", numeric_cols, default=numeric_cols[:2], key=f"chart_columns_{file.file_id}")
+            with col3:
+                budget = st.number_input(f"Point budget for {file.name}", min_value=100, max_value=20000, value=DEFAULT_POINT_BUDGET, step=100, key=f"chart_budget_{file.file_id}")
+            if chart_columns:
+                chart_data = load_chart_data(df, data_key, chart_type, tuple(chart_columns), int(budget))
+                if chart_type == "Line (LTTB)":
+                    st.line_chart(chart_data)
+                else:
+                    st.bar_chart(chart_data)
+                if len(chart_data) < len(df):
+                    st.caption(f"Showing {len(chart_data):,} aggregated points for {len(df):,} rows.")
 
-        st.subheader("🎯 Select Columns to Convert")
-        columns = st.multiselect(f"Choose Columns for {file.name}", df.columns, default=df.columns)
-        df = df[columns]   
-        
-        st.subheader("📊 Data Visualization")
-        if st.checkbox(f"Show Visualization for {file.name}"):
-            st.bar_chart(df.select_dtypes(include='number').iloc[:, :2])   
+    st.subheader("🔄 Conversion Options")
+    conversion_type = st.radio(f"Convert {file.name} to:", list(OUTPUT_FORMATS), key=file.name, horizontal=True)
+    extension, mime_type = OUTPUT_FORMATS[conversion_type]
+    compression = None
+    if conversion_type in COMPRESSION_OPTIONS:
+        compression = st.selectbox(f"Compression for {file.name}", COMPRESSION_OPTIONS[conversion_type], key=f"compression_{file.file_id}")
+
+    benchmarks = st.session_state.setdefault("format_benchmarks", {})
+    benchmark_key = data_key
+    if st.button(f"Compare Output Formats for {file.name}"):
+        with st.spinner("Writing every format..."):
+            benchmarks[benchmark_key] = benchmark_formats(df)
+    if benchmark_key in benchmarks:
+        st.dataframe(benchmarks[benchmark_key], hide_index=True)
+
+    if st.button(f"Convert {file.name}"):
+        buffer = BytesIO()  
+        write_frame(df, conversion_type, buffer, compression)
+        buffer.seek(0)
+
+        st.download_button(
+            label=f"⬇️ Download {file.name} as {conversion_type}",
+            data=buffer,
+            file_name=file.name.replace(file_extension, extension),
+            mime=mime_type
+        )
+
+    return (file.name.replace(file_extension, extension), lambda out: write_frame(df, conversion_type, out, compression)), profile
+
+sweep_stale_outputs()
+
+st.title("Data Sweeper")  
+st.write("Transform your files between CSV, Excel, Parquet and Feather formats with built-in data cleaning and visualization.")
  
-        st.subheader("🔄 Conversion Options")
-        conversion_type = st.radio(f"Convert {file.name} to:", ["CSV", "Excel"], key=file.name)
-        if st.button(f"Convert {file.name}"):
-            buffer = BytesIO()  
-            if conversion_type == "CSV":
-                df.to_csv(buffer, index=False)  
-                file_name = file.name.replace(file_extension, ".csv")
-                mime_type = "text/csv"
-            elif conversion_type == "Excel":
-                df.to_excel(buffer, index=False, engine='openpyxl')  
-                file_name = file.name.replace(file_extension, ".xlsx")
-                mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            buffer.seek(0)
+uploaded_files = st.file_uploader("Upload your files (CSV, Excel, Parquet or Feather):", type=[extension[1:] for extension in SUPPORTED_EXTENSIONS], accept_multiple_files=True)
+
  
+if uploaded_files:
+    st.session_state.setdefault("file_hashes", {})
+    cleaning_steps = st.session_state.setdefault("cleaning_steps", {})
+    containers = {file.file_id: st.container() for file in uploaded_files}
+    zip_entries = {}
+    profiles = {}
+
+    # Parse and clean the regular uploads on a thread pool; each file's section is
+    # rendered into its own container as soon as that file is ready
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=INGEST_WORKERS) as executor:
+        futures = {}
+        for file in uploaded_files:
+            file_extension = os.path.splitext(file.name)[-1].lower()
+            with containers[file.file_id]:
+                if file_extension not in SUPPORTED_EXTENSIONS:
+                    st.error(f"Unsupported file type: {file_extension}")
+                    continue
+
+                if file_extension in (".csv", ".xlsx") and st.checkbox(f"Large file mode (streaming) for {file.name}", value=file.size > LARGE_FILE_THRESHOLD):
+                    zip_entries[file.file_id], profiles[file.file_id] = render_streaming_section(file, file_extension)
+                    continue
+
+                if file_extension in COLUMNAR_EXTENSIONS:
+                    parse_options = render_columnar_read_options(file, file_extension)
+                else:
+                    parse_options = render_tabular_read_options(file, file_extension)
+
+            steps = cleaning_steps.setdefault(file.file_id, [])
+            future = executor.submit(load_in_thread, ctx, file, file_extension, parse_options, steps)
+            futures[future] = (file, file_extension, steps, parse_options)
+
+        for future in as_completed(futures):
+            file, file_extension, steps, parse_options = futures[future]
+            with containers[file.file_id]:
+                zip_entries[file.file_id], profiles[file.file_id] = render_file_section(file, file_extension, future.result(), steps, parse_options)
+
+    if len(profiles) > 1:
+        st.subheader("📋 Combined Column Profile")
+        if st.checkbox("Show Combined Column Profile"):
+            # File profiles are cached, so only files not profiled yet are read
+            with st.spinner("Profiling files..."):
+                render_profile(merge_profiles(profiles[file.file_id]() for file in uploaded_files if file.file_id in profiles))
+
+    if len(zip_entries) > 1:
+        st.subheader("📦 Convert All Files")
+        if st.button("Convert All to ZIP"):
+            with st.spinner("Building ZIP archive..."):
+                zip_path = replace_output("zip", build_zip([zip_entries[file.file_id] for file in uploaded_files if file.file_id in zip_entries]))
             st.download_button(
-                label=f"⬇️ Download {file.name} as {conversion_type}",
-                data=buffer,
-                file_name=file_name,
-                mime=mime_type
+                label="⬇️ Download All as ZIP",
+                data=lambda path=zip_path: read_output_file(path),
+                file_name="data_sweeper_outputs.zip",
+                mime="application/zip",
+                on_click="ignore"
             )
 
 st.success("🎉 All files processed successfully!")  
\ No newline at end of file
@@ -1,19 +1,44 @@
+import time
 import streamlit as st
+from core.growth_mindset import JOURNAL_FIELDS, QUOTE, Journal, challenge_message, reflection_message, achievement_message, journal_key
 
 st.set_page_config(page_title="growth mindset", page_icon="✦")
+
+# Shared journal, opened once per process and reused across reruns and sessions
+@st.cache_resource
+def get_journal():
+    return Journal()
+
+# Function to get the session's journal key, derived again only when the name or passphrase changes
+def get_journal_key(name, passphrase):
+    cached = st.session_state.get("journal_key")
+    if cached is None or cached[0] != (name, passphrase):
+        cached = ((name, passphrase), journal_key(name, passphrase))
+        st.session_state["journal_key"] = cached
+    return cached[1]
+
+# Function to show journal entries, newest first
+def show_entries(entries):
+    for entry in entries:
+        with st.container(border=True):
+            st.caption(entry["created_at"])
+            for field in JOURNAL_FIELDS:
+                if entry[field]:
+                    st.write(f"**{field.title()}:** {entry[field]}")
+
 st.title("🌱 Growth Mindset")
 
 st.header("Welcom to Your Growth Journey")
 st.write("Embarce challanges, learn from mistakes, and unlock full potential. This AI-powered app helps you built a growth mindset with reflection, challenges, and achivements! ✨")
 
 st.header("💡 Today's Growth Mindset Quote")
-st.write("We can't become what we need to be by remaining what we are. —Oprah Winfrey")
+st.write(QUOTE)
 
 st.header("What's Your Chanllenge Today?")
 user_input = st.text_input("Describe a challenge you are facing")
 
 if user_input:
-    st.success(f"You are facing: {user_input}. Keep pushing forward towards goal!")
+    st.success(challenge_message(user_input))
 else:
     st.warning("Tell us about your challenge to get started!")
 
@@ -21,7 +46,7 @@ st.header("Reflection on Your Learning")
 reflection = st.text_area("Write your reflections here:")
 
 if reflection:
-    st.success(f"🌟 Greate Insight! Your reflection: {reflection}")
+    st.success(reflection_message(reflection))
 else:
     st.info("Reflection on past experience help you grow! Share your difficulties")
 
@@ -29,10 +54,41 @@ st.header("🏆 Celebrate Your Wins!")
 achivments = st.text_input("Share something you have recently accomplished:")
 
 if achivments:
-    st.success(f"🎉 Amazing! you achived: {achivments}")
+    st.success(achievement_message(achivments))
 else:
     st.info("Big or small, every achivement counts! Share one now!")
 
+st.header("📔 Your Journal")
+journal_name = st.text_input("Your name:").strip()
+journal_passphrase = st.text_input("Journal passphrase:", type="password")
+
+if not journal_name or not journal_passphrase:
+    st.info("Enter your name and a passphrase to save today's entries and look back on past ones. Only the same name and passphrase open the journal again.")
+else:
+    journal = get_journal()
+    journal_user = get_journal_key(journal_name, journal_passphrase)
+    if st.button("Save to Journal", type="primary"):
+        if user_input or reflection or achivments:
+            journal.add_entry(journal_user, user_input, reflection, achivments)
+            st.success("Saved! Your entry is now part of your journal.")
+        else:
+            st.warning("Write a challenge, reflection or achievement first!")
+
+    by_month, search_tab = st.tabs(["By Month", "Search"])
+    with by_month:
+        counts = dict(journal.month_counts(journal_user))
+        current_month = time.strftime("%Y-%m")
+        months = [current_month] + [month for month in counts if month != current_month]
+        month = st.selectbox("Month:", months, format_func=lambda month: f"{month} ({counts.get(month, 0)} entries)")
+        show_entries(journal.month_entries(journal_user, month))
+    with search_tab:
+        query = st.text_input("Search your journal:")
+        if query:
+            start = time.perf_counter()
+            results = journal.search(journal_user, query)
+            st.caption(f"{len(results)} entries found in {(time.perf_counter() - start) * 1000:.1f} ms")
+            show_entries(results)
+
 st.write("_ _ _")
 st.write("Keep belive in yourself. Growth is a journey, not a destination! ✨")
 st.write("© Created by Zayan Ahmed")
\ No newline at end of file
@@ -1,5 +1,10 @@
-import re
 import streamlit as st
+import io
+import os
+import pandas as pd
+from core.breach_corpus import BREACH_CORPUS_FILE, BreachCorpus
+from core.password_audit import AUDIT_SAMPLE_ROWS, AUDIT_WORKERS, audit_passwords, create_audit_pool
+from core.password_strength import MAX_SCORE, RULE_MESSAGES, analyze_password, check_password_strength, strength_label
  
 st.set_page_config(page_title="Password Strength Checker", page_icon="🔒", layout="centered")
  
@@ -37,66 +42,90 @@ st.markdown("""
 st.title("🔐 Password Strength Checker")
 st.write("Enter your password to check its security level.")
 
-COMMON_PASSWORDS = {
-    "password", "123456", "12345678", "qwerty", "abc123", 
-    "letmein", "monkey", "111111", "123123", "welcome"
-}
+# Breached-password index, memory-mapped once per process and again if it is rebuilt
+@st.cache_resource(max_entries=1)
+def open_cached_breach_corpus(modified):
+    return BreachCorpus(BREACH_CORPUS_FILE)
 
-def check_password_strength(password):
-    feedback = []
-    score = 0
-    max_score = 6  
+# Function to get the index, or None until it has been built. The missing case is not
+# cached, so an index built while the app runs is used from the next rerun on.
+def get_breach_corpus():
+    if not os.path.exists(BREACH_CORPUS_FILE):
+        return None
+    return open_cached_breach_corpus(os.path.getmtime(BREACH_CORPUS_FILE))
 
-  
-    if len(password) >= 8:
-        score += 1
-        if len(password) >= 12:
-            score += 1
-    else:
-        feedback.append("❌ Password should be at least 8 characters long.")
- 
-    if re.search(r"[A-Z]", password) and re.search(r"[a-z]", password):
-        score += 1
-    else:
-        feedback.append("❌ Include both uppercase and lowercase letters.")
- 
-    if re.search(r"\d", password):
-        score += 1
-    else:
-        feedback.append("❌ Add at least one number (0-9).")
+# Worker pool for bulk audits, shared by every session; each worker maps the index itself
+@st.cache_resource
+def get_audit_pool():
+    return create_audit_pool(AUDIT_WORKERS, BREACH_CORPUS_FILE)
 
-    if re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-        score += 1
-    else:
-        feedback.append("❌ Include at least one special character (!@#$%^&*(),.?\":{}|<>).")
- 
-    if password.lower() in COMMON_PASSWORDS:
-        feedback.append("❌ This is a very common password. Please choose something more unique.")
-        score = 0  
-
-    if score >= 6:
-        strength_message = "✅ Very Strong Password!"
-    elif score >= 4:
-        strength_message = "⚠️ Moderate Password - Consider adding more security features."
-    else:
-        strength_message = "❌ Weak Password - Improve it using the suggestions above."
-
-    strength_percent = int((score / max_score) * 100)
-    
-    return strength_message, feedback, strength_percent
+corpus = get_breach_corpus()
+if corpus is not None:
+    st.caption(f"Passwords are also checked against {len(corpus):,} breached passwords.")
 
 password = st.text_input("Enter your password:", type="password")
 
+# The analysis is cheap enough to refresh on every rerun, before the button is pressed
+analysis = analyze_password(password, corpus) if password else None
+if analysis is not None:
+    st.caption(f"Estimated entropy: {analysis['entropy_bits']:.1f} bits (character pool of {analysis['pool_size']})")
+
 if st.button("Check Password Strength"):
     if password:
-        strength_message, suggestions, strength_percent = check_password_strength(password)
+        strength_message, suggestions, strength_percent = check_password_strength(password, analysis)
         
         st.markdown(f"### Strength: {strength_message}")
         st.progress(strength_percent)
         
+        patterns = [
+            f"{analysis[key]} {label}" for key, label in
+            (("repeat_chars", "repeated"), ("sequence_chars", "in sequences"), ("walk_chars", "in keyboard walks"))
+            if analysis[key]
+        ]
+        st.write(f"**Entropy:** {analysis['entropy_bits']:.1f} bits over {analysis['length']} characters" + (f" ({', '.join(patterns)})" if patterns else ""))
+        
         if suggestions:
             st.markdown("#### Suggestions to improve your password:")
             for suggestion in suggestions:
                 st.markdown(f"- {suggestion}")
     else:
         st.error("Please enter a password to check.")
+
+st.markdown("---")
+st.subheader("📋 Bulk Password Audit")
+st.write("Score a whole file of passwords, one per line, with the same rules.")
+audit_file = st.file_uploader("Upload a password list:", type=["txt", "csv"])
+include_passwords = st.checkbox("Include the passwords in the per-row report")
+st.caption(f"The per-row report covers the first {AUDIT_SAMPLE_ROWS:,} passwords. For all of them, run "
+           "`python -m core.password_audit passwords.txt --report audit.csv`.")
+
+if audit_file is not None and st.button("Run Audit"):
+    progress_bar = st.progress(0.0, text="Auditing...")
+    # Only a sample of the per-row report is kept, in memory and never on disk since it may
+    # hold the passwords themselves, so memory stays flat however long the list
+    report = io.StringIO(newline="")
+    audit_file.seek(0)
+    summary = audit_passwords(
+        audit_file, get_audit_pool(), AUDIT_WORKERS, report, include_passwords, report_rows=AUDIT_SAMPLE_ROWS,
+        progress=lambda done: progress_bar.progress(min(audit_file.tell() / max(audit_file.size, 1), 1.0), text=f"Audited {done:,} passwords"),
+    )
+    progress_bar.progress(1.0, text=f"Audited {summary['total']:,} passwords")
+
+    st.write(f"**Mean entropy:** {summary['mean_entropy']:.1f} bits")
+    histogram = pd.DataFrame(
+        {"Passwords": list(summary["histogram"].values())},
+        index=pd.Index([f"{int(score / MAX_SCORE * 100)}% {strength_label(score)}" for score in summary["histogram"]], name="Score"),
+    )
+    st.bar_chart(histogram)
+    st.markdown("#### Most-failed rules:")
+    st.dataframe(pd.DataFrame(
+        [(RULE_MESSAGES[rule], count, f"{count / max(summary['total'], 1):.1%}") for rule, count in summary["failures"]],
+        columns=["Rule", "Passwords", "Share"],
+    ), hide_index=True)
+    st.download_button(
+        label=f"⬇️ Download Per-Row Report (CSV, first {min(summary['total'], AUDIT_SAMPLE_ROWS):,} passwords)",
+        data=report.getvalue().encode("utf-8"),
+        file_name="password_audit.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
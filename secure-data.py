@@ -1,151 +1,123 @@
 import streamlit as st
-import hashlib
-import base64
-import json
 import time
-import os
-import random
-import string
+import csv
+import io
+import math
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core.instrumentation import approximate_size, phase, start_phase_timer, stop_phase_timer
+from core.secure_data import (
+    ATTEMPT_COST, CLIENT_ADDRESS_HEADER, CRYPTOGRAPHY_AVAILABLE, FAILURE_COST, KDF_ITERATIONS, RATE_LIMITS, STORAGE_BACKEND,
+    RateLimiter, SessionRecordCache,
+    decrypt_chunk, decrypt_data, decrypt_stream, encrypt_data, get_key_cache_stats, hash_passkey,
+    make_record_id, open_store, read_batch_rows, resolve_record_id, write_encrypted_file,
+)
+from core.secure_data_batch import create_process_pool, run_batch, BATCH_WORKERS
 
-# Check if cryptography is available, otherwise use a simpler encryption
-try:
-    from cryptography.fernet import Fernet
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-    CRYPTOGRAPHY_AVAILABLE = True
-except ImportError:
-    CRYPTOGRAPHY_AVAILABLE = False
+# Time every phase of this rerun; the breakdown is shown in the sidebar
+phase_timer = start_phase_timer()
 
-# Session state initialization
-if 'stored_data' not in st.session_state:
-    st.session_state.stored_data = {}  # {"user1_data": {"encrypted_text": "xyz", "passkey": "hashed"}}
+# Session state initialization. Records and rate limits live in the process-wide
+# caches below, not here; failed_attempts only drives the warning on the Retrieve page.
+if 'rerun_timings' not in st.session_state:
+    st.session_state.rerun_timings = []  # phase timings of the last RERUN_HISTORY reruns
 if 'failed_attempts' not in st.session_state:
     st.session_state.failed_attempts = 0
-if 'last_failed_time' not in st.session_state:
-    st.session_state.last_failed_time = 0
-if 'locked_out' not in st.session_state:
-    st.session_state.locked_out = False
-if 'cipher_key' not in st.session_state and CRYPTOGRAPHY_AVAILABLE:
-    # Generate a key (this should be stored securely in production)
-    st.session_state.cipher_key = Fernet.generate_key()
-    st.session_state.cipher = Fernet(st.session_state.cipher_key)
 
 # Constants
-LOCKOUT_DURATION = 30  # seconds
-MAX_ATTEMPTS = 3
+MAX_ATTEMPTS = RATE_LIMITS["client"][0] // (ATTEMPT_COST + FAILURE_COST)  # failed attempts before lockout
 MASTER_PASSWORD = "admin123"  # In a real app, this would be stored more securely
+RERUN_HISTORY = 20
+TIMED_PHASES = ["load", "kdf", "cipher", "render"]
 
-# Simple Caesar cipher for fallback encryption when cryptography is not available
-def caesar_encrypt(text, shift):
-    result = ""
-    for char in text:
-        if char.isalpha():
-            ascii_offset = ord('a') if char.islower() else ord('A')
-            result += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
-        else:
-            result += char
-    return result
+# Rate limiter shared by every session and server process
+@st.cache_resource
+def get_rate_limiter():
+    return RateLimiter()
 
-def caesar_decrypt(text, shift):
-    return caesar_encrypt(text, -shift)
+# Function to identify the client by its address, so opening new sessions does not get
+# it a fresh bucket. Behind a trusted proxy the address is the last one the proxy added
+# to CLIENT_ADDRESS_HEADER; only a client with no known address is keyed by its session.
+def client_id():
+    ip_address = st.context.ip_address
+    if CLIENT_ADDRESS_HEADER:
+        forwarded = st.context.headers.get(CLIENT_ADDRESS_HEADER, "")
+        ip_address = forwarded.split(",")[-1].strip() or ip_address
+    if isinstance(ip_address, str) and ip_address:
+        return f"address:{ip_address}"
+    return f"session:{current_session_id()}"
 
-# Function to generate a pseudo-random string for the ID
-def generate_id(length=10):
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
+# Function to list the rate limit buckets charged for an attempt on a record
+def attempt_buckets(record_id):
+    return [("client", client_id()), ("record", record_id)]
 
-# Function to hash passkey
-def hash_passkey(passkey):
-    return hashlib.sha256(passkey.encode()).hexdigest()
+# Function to start a decryption attempt. It is charged before the record is looked up
+# or any key derived; returns 0 if the attempt may go ahead, else the seconds to wait.
+def begin_attempt(record_id):
+    return get_rate_limiter().acquire(attempt_buckets(record_id))
 
-# Function to encrypt data
-def encrypt_data(text, passkey):
-    if CRYPTOGRAPHY_AVAILABLE:
-        key = generate_key_from_passkey(passkey)
-        cipher = Fernet(key)
-        return cipher.encrypt(text.encode()).decode()
+# Function to finish a decryption attempt. A success gives the client its attempt
+# token back, so only failures drain the client bucket; a failure costs FAILURE_COST more.
+def end_attempt(record_id, success):
+    if success:
+        get_rate_limiter().refund([("client", client_id())])
     else:
-        # Fallback to Caesar cipher with a shift derived from the passkey
-        shift = sum(ord(c) for c in passkey) % 26
-        encrypted = caesar_encrypt(text, shift)
-        # Create a unique ID for this encrypted text
-        unique_id = generate_id()
-        return f"{unique_id}:{encrypted}"
-
-# Function to decrypt data
-def decrypt_data(encrypted_text, passkey):
-    try:
-        if CRYPTOGRAPHY_AVAILABLE:
-            key = generate_key_from_passkey(passkey)
-            cipher = Fernet(key)
-            return cipher.decrypt(encrypted_text.encode()).decode()
-        else:
-            # Parse the unique ID and encrypted text
-            if ":" not in encrypted_text:
-                return None
-            unique_id, encrypted = encrypted_text.split(":", 1)
-            shift = sum(ord(c) for c in passkey) % 26
-            return caesar_decrypt(encrypted, shift)
-    except Exception:
-        return None
-
-# Function to generate key from passkey (only if cryptography is available)
-def generate_key_from_passkey(passkey, salt=b'salt_'):
-    if CRYPTOGRAPHY_AVAILABLE:
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(passkey.encode()))
-        return key
-    return None
+        get_rate_limiter().penalize(attempt_buckets(record_id))
+        st.session_state.failed_attempts += 1
 
-# Function to verify passkey
-def verify_passkey(encrypted_text, passkey):
+# Function to verify passkey and settle the attempt
+def verify_passkey(record_id, passkey):
     hashed_passkey = hash_passkey(passkey)
     
-    if encrypted_text in st.session_state.stored_data:
-        if st.session_state.stored_data[encrypted_text]["passkey"] == hashed_passkey:
-            st.session_state.failed_attempts = 0
-            return True
-    
-    st.session_state.failed_attempts += 1
-    st.session_state.last_failed_time = time.time()
-    
-    if st.session_state.failed_attempts >= MAX_ATTEMPTS:
-        st.session_state.locked_out = True
-    
-    return False
+    record = get_record(record_id)
+    success = record is not None and record["passkey"] == hashed_passkey
+    end_attempt(record_id, success)
+    return success
 
-# Function to check lockout status
+# Function to check lockout status; returns the seconds until this client may try again
 def check_lockout():
-    if st.session_state.locked_out:
-        time_passed = time.time() - st.session_state.last_failed_time
-        if time_passed >= LOCKOUT_DURATION:
-            st.session_state.locked_out = False
-            return False
-        return True
-    return False
+    return get_rate_limiter().retry_after([("client", client_id())])
+
+# Function to count the failed attempts this client can still make before it is locked out
+def attempts_remaining():
+    tokens = get_rate_limiter().tokens("client", client_id())
+    return int((tokens - ATTEMPT_COST) // (ATTEMPT_COST + FAILURE_COST)) + 1 if tokens >= ATTEMPT_COST else 0
 
-# Function to save data to JSON file (for persistence)
-def save_data_to_file():
-    with open('encrypted_data.json', 'w') as f:
-        json.dump(st.session_state.stored_data, f)
+# Shared storage backend, opened once per process and reused across reruns and sessions
+@st.cache_resource
+def get_store(backend=STORAGE_BACKEND):
+    return open_store(backend)
 
-# Function to load data from JSON file
-def load_data_from_file():
-    try:
-        with open('encrypted_data.json', 'r') as f:
-            st.session_state.stored_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        st.session_state.stored_data = {}
+# Unsaved records of every session, held once per process
+@st.cache_resource
+def get_session_records():
+    return SessionRecordCache()
 
-# Try to load data at startup
-try:
-    load_data_from_file()
-except Exception:
-    pass
+# Function to get the ID of the current browser session
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+# Function to look up a record in this session's unsaved records, then in the persistent store
+def get_record(key):
+    with phase("load"):
+        record = get_session_records().get(current_session_id(), key)
+        if record is None:
+            record = get_store().get(key)
+        return record
+
+# Function to save a record to the persistent store
+def save_data_to_file(key, record):
+    with phase("load"):
+        get_store().put(key, record)
+
+# Function to keep a record in memory for this session only
+def save_data_to_session(key, record):
+    get_session_records().put(current_session_id(), key, record)
+
+# Shared process pool for batch jobs, sized to the available cores
+@st.cache_resource
+def get_process_pool():
+    return create_process_pool(BATCH_WORKERS)
 
 # Streamlit UI
 st.title("🔒 Secure Data Encryption System")
@@ -155,7 +127,7 @@ if not CRYPTOGRAPHY_AVAILABLE:
     st.warning("⚠️ The 'cryptography' package is not installed. Using simplified encryption instead. For better security, install the package with: `pip install cryptography`")
 
 # Navigation
-menu = ["Home", "Store Data", "Retrieve Data", "Login"]
+menu = ["Home", "Store Data", "Retrieve Data", "Batch", "Login"]
 choice = st.sidebar.selectbox("Navigation", menu)
 
 # Check for lockout and redirect if needed
@@ -171,15 +143,16 @@ if choice == "Home":
     if CRYPTOGRAPHY_AVAILABLE:
         st.markdown("""
         - **PBKDF2** for secure key derivation
+        - **Envelope encryption**: a random data key per record, wrapped under your passkey
         - **Fernet symmetric encryption** for data security
         - **SHA-256** for passkey hashing
-        - **In-memory storage** with optional JSON persistence
+        - **In-memory storage** with optional SQLite persistence
         """)
     else:
         st.markdown("""
         - **Caesar cipher** for basic encryption (simplified)
         - **SHA-256** for passkey hashing
-        - **In-memory storage** with optional JSON persistence
+        - **In-memory storage** with optional SQLite persistence
         """)
     
     st.warning("⚠️ Remember your passkeys! There's no way to recover your data if you forget them.")
@@ -187,7 +160,16 @@ if choice == "Home":
 elif choice == "Store Data":
     st.subheader("📂 Store Data Securely")
     
-    user_data = st.text_area("Enter Data to Encrypt:", height=150)
+    input_mode = "Text"
+    if CRYPTOGRAPHY_AVAILABLE:
+        input_mode = st.radio("Input Type:", ["Text", "File (streaming)"], horizontal=True)
+    
+    user_data = None
+    uploaded_file = None
+    if input_mode == "Text":
+        user_data = st.text_area("Enter Data to Encrypt:", height=150)
+    else:
+        uploaded_file = st.file_uploader("Upload a File to Encrypt:")
     passkey = st.text_input("Create Passkey:", type="password")
     confirm_passkey = st.text_input("Confirm Passkey:", type="password")
     
@@ -200,101 +182,277 @@ elif choice == "Store Data":
         persist = st.checkbox("Save to file (persistence)")
     
     if store_button:
-        if not user_data:
+        if not user_data and uploaded_file is None:
             st.error("⚠️ Please enter data to encrypt!")
         elif not passkey:
             st.error("⚠️ Please create a passkey!")
         elif passkey != confirm_passkey:
             st.error("⚠️ Passkeys don't match!")
+        elif uploaded_file is not None:
+            # Large payloads are encrypted chunk by chunk straight to disk
+            record_id, path, size, chunk_count, wrapped_key = write_encrypted_file(uploaded_file, passkey)
+            record = {
+                "file": path,
+                "name": uploaded_file.name,
+                "size": size,
+                "chunks": chunk_count,
+                "wrapped_key": wrapped_key,
+                "passkey": hash_passkey(passkey),
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            if persist:
+                save_data_to_file(record_id, record)
+            else:
+                save_data_to_session(record_id, record)
+            
+            st.success(f"✅ File encrypted and stored successfully! ({size / 1024:.2f} KB in {chunk_count} chunks)")
+            st.markdown("**Record ID:**")
+            st.code(record_id, language=None)
+            st.info("📌 Copy this record ID - you'll need it to retrieve your file later.")
         else:
             hashed_passkey = hash_passkey(passkey)
             encrypted_text = encrypt_data(user_data, passkey)
+            record_id = make_record_id(encrypted_text)
             
-            # Store the data
-            st.session_state.stored_data[encrypted_text] = {
+            # Store the data; the ciphertext is kept once, under its short record ID
+            record = {
                 "encrypted_text": encrypted_text, 
                 "passkey": hashed_passkey,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
             }
             
             if persist:
-                save_data_to_file()
+                save_data_to_file(record_id, record)
+            else:
+                save_data_to_session(record_id, record)
             
             st.success("✅ Data encrypted and stored successfully!")
+            st.markdown("**Record ID:**")
+            st.code(record_id, language=None)
+            st.markdown("**Encrypted Data:**")
             st.code(encrypted_text, language=None)
-            st.info("📌 Copy this encrypted text - you'll need it to retrieve your data later.")
+            st.info("📌 Copy the record ID or the encrypted text - you'll need one of them to retrieve your data later.")
 
 elif choice == "Retrieve Data":
     st.subheader("🔍 Retrieve Your Data")
     
-    encrypted_text = st.text_area("Enter Encrypted Data:")
+    lookup_text = st.text_area("Enter Record ID or Encrypted Data:")
     passkey = st.text_input("Enter Passkey:", type="password")
     
+    with st.expander("Large file options"):
+        preview_chunk = st.number_input("Chunk to preview:", min_value=0, value=0, step=1)
+    
     if st.button("Decrypt", type="primary"):
-        if not encrypted_text:
-            st.error("⚠️ Please enter the encrypted data!")
+        if not lookup_text:
+            st.error("⚠️ Please enter the record ID or encrypted data!")
         elif not passkey:
             st.error("⚠️ Please enter your passkey!")
         else:
-            # Check if the encrypted text exists in storage
-            if encrypted_text in st.session_state.stored_data:
-                if verify_passkey(encrypted_text, passkey):
-                    decrypted_text = decrypt_data(encrypted_text, passkey)
-                    if decrypted_text:
-                        st.success("✅ Data decrypted successfully!")
-                        st.markdown("### Decrypted Content:")
-                        st.markdown(f"```\n{decrypted_text}\n```")
+            # Check if the record exists in storage. The attempt is rate limited first,
+            # so floods of guesses are turned away before any key is derived.
+            record_id = resolve_record_id(lookup_text)
+            wait = begin_attempt(record_id)
+            record = None if wait else get_record(record_id)
+            if wait:
+                st.error(f"⏳ Too many attempts! Please try again in {math.ceil(wait)} seconds.")
+            elif record is not None:
+                if verify_passkey(record_id, passkey):
+                    if "file" in record:
+                        # Only the requested chunk is decrypted for the preview
+                        chunk_index = min(preview_chunk, record["chunks"] - 1)
+                        chunk = decrypt_chunk(record["file"], passkey, chunk_index, record.get("wrapped_key"))
+                        if chunk is not None:
+                            st.success(f"✅ File unlocked: {record['name']} ({record['size'] / 1024:.2f} KB, {record['chunks']} chunks)")
+                            st.markdown(f"### Preview of chunk {chunk_index}:")
+                            st.code(chunk.decode(errors="replace"), language=None)
+                            st.download_button(
+                                label=f"⬇️ Download {record['name']}",
+                                data=lambda path=record["file"], key=passkey, wrapped_key=record.get("wrapped_key"): b"".join(decrypt_stream(path, key, wrapped_key=wrapped_key)),
+                                file_name=record["name"],
+                                on_click="ignore",
+                            )
+                        else:
+                            st.error("❌ Decryption failed. Invalid passkey!")
                     else:
-                        st.error("❌ Decryption failed. Invalid passkey!")
+                        decrypted_text = decrypt_data(record["encrypted_text"], passkey)
+                        if decrypted_text:
+                            st.success("✅ Data decrypted successfully!")
+                            st.markdown("### Decrypted Content:")
+                            st.markdown(f"```\n{decrypted_text}\n```")
+                        else:
+                            st.error("❌ Decryption failed. Invalid passkey!")
                 else:
-                    remaining = MAX_ATTEMPTS - st.session_state.failed_attempts
+                    remaining = attempts_remaining()
                     if remaining > 0:
                         st.error(f"❌ Incorrect passkey! Attempts remaining: {remaining}")
                     else:
                         st.error("❌ Too many failed attempts! Account locked.")
                         st.warning("🔒 Redirecting to login page...")
                         time.sleep(1)
-                        st.experimental_rerun()
+                        st.rerun()
             else:
+                # Probing for record IDs counts as a failure too
+                end_attempt(record_id, False)
                 st.error("❌ No such encrypted data found in storage!")
     
-    # Display attempts warning if needed
-    if st.session_state.failed_attempts > 0 and st.session_state.failed_attempts < MAX_ATTEMPTS:
-        st.warning(f"⚠️ Failed attempts: {st.session_state.failed_attempts}/{MAX_ATTEMPTS}")
+    # Display attempts warning if needed. Failures are forgiven once the client's
+    # bucket has refilled.
+    if attempts_remaining() == MAX_ATTEMPTS:
+        st.session_state.failed_attempts = 0
+    failed_attempts = st.session_state.failed_attempts
+    if failed_attempts > 0 and failed_attempts < MAX_ATTEMPTS:
+        st.warning(f"⚠️ Failed attempts: {failed_attempts}/{MAX_ATTEMPTS}")
+
+elif choice == "Batch":
+    st.subheader("📦 Batch Encrypt & Decrypt")
+    
+    if not CRYPTOGRAPHY_AVAILABLE:
+        st.warning("⚠️ Batch mode requires the 'cryptography' package.")
+    else:
+        batch_mode = st.radio("Operation:", ["Encrypt", "Decrypt"], horizontal=True)
+        st.caption("Records are CSV with a `data,passkey` header. When decrypting, `data` may be a record ID or encrypted text.")
+        batch_file = st.file_uploader("Upload Records (CSV):", type=["csv"])
+        batch_text = st.text_area("...or paste records:", height=150)
+        persist = batch_mode == "Encrypt" and st.checkbox("Save to file (persistence)")
+        
+        if st.button("Run Batch", type="primary"):
+            csv_text = batch_file.getvalue().decode() if batch_file is not None else batch_text
+            rows = read_batch_rows(csv_text) if csv_text else []
+            
+            if not rows:
+                st.error("⚠️ Please provide records with `data` and `passkey` columns!")
+            else:
+                results = [None] * len(rows)
+                if batch_mode == "Encrypt":
+                    items = rows
+                    positions = list(range(len(rows)))
+                else:
+                    # Look up and verify every record up front; only verified ones reach the pool.
+                    # Each row is an attempt like a single decryption: verified rows cost the
+                    # client nothing, failed ones drain its bucket, and every row is charged to
+                    # its record. Rows turned away by the rate limit are listed afterwards.
+                    items = []
+                    positions = []
+                    unprocessed = []
+                    for position, (data, passkey) in enumerate(rows):
+                        record_id = resolve_record_id(data)
+                        if check_lockout():
+                            unprocessed += [(row, resolve_record_id(row_data)) for row, (row_data, _) in enumerate(rows[position:], position + 1)]
+                            break
+                        if begin_attempt(record_id):
+                            unprocessed.append((position + 1, record_id))
+                            continue
+                        record = get_record(record_id)
+                        if record is not None and "encrypted_text" in record and verify_passkey(record_id, passkey):
+                            items.append((record["encrypted_text"], passkey))
+                            positions.append(position)
+                        elif record is None or "encrypted_text" not in record:
+                            end_attempt(record_id, False)
+                
+                progress = st.progress(0.0, text=f"Processing {len(items)} records on {BATCH_WORKERS} workers...")
+                done = 0
+                with phase("cipher"):
+                    for group in run_batch(get_process_pool(), items, batch_mode.lower(), KDF_ITERATIONS):
+                        for index, result in group:
+                            results[positions[index]] = result
+                        done += len(group)
+                        progress.progress(done / max(len(items), 1), text=f"Processed {done}/{len(items)} records")
+                
+                output = io.StringIO()
+                writer = csv.writer(output)
+                if batch_mode == "Encrypt":
+                    new_records = {}
+                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                    writer.writerow(["record_id", "encrypted_text"])
+                    for (data, passkey), encrypted_text in zip(rows, results):
+                        record_id = make_record_id(encrypted_text)
+                        new_records[record_id] = {
+                            "encrypted_text": encrypted_text,
+                            "passkey": hash_passkey(passkey),
+                            "timestamp": timestamp
+                        }
+                        writer.writerow([record_id, encrypted_text])
+                    if persist:
+                        with phase("load"):
+                            get_store().put_many(new_records.items())
+                    else:
+                        get_session_records().put_many(current_session_id(), new_records.items())
+                    st.success(f"✅ Encrypted and stored {len(new_records)} records!")
+                else:
+                    writer.writerow(["data", "decrypted_text"])
+                    for (data, passkey), decrypted_text in zip(rows, results):
+                        writer.writerow([data, decrypted_text if decrypted_text is not None else ""])
+                    failed = sum(1 for result in results if result is None) - len(unprocessed)
+                    st.success(f"✅ Decrypted {len(rows) - failed - len(unprocessed)} of {len(rows)} records!")
+                    if failed:
+                        st.error(f"❌ {failed} records could not be decrypted (not found or wrong passkey).")
+                    if unprocessed:
+                        st.warning(f"⏳ Rate limit reached: {len(unprocessed)} records were not processed. Try them again later.")
+                        st.dataframe({"Row": [row for row, _ in unprocessed], "Record ID": [record_id for _, record_id in unprocessed]}, hide_index=True)
+                
+                st.download_button(
+                    label="⬇️ Download Results (CSV)",
+                    data=output.getvalue(),
+                    file_name=f"batch_{batch_mode.lower()}_results.csv",
+                    mime="text/csv",
+                    on_click="ignore",
+                )
 
 elif choice == "Login":
     st.subheader("🔑 Reauthorization Required")
     
-    if check_lockout():
-        time_passed = time.time() - st.session_state.last_failed_time
-        time_remaining = max(0, LOCKOUT_DURATION - time_passed)
-        
-        st.error(f"🔒 Account locked due to too many failed attempts!")
-        st.warning(f"Please wait {int(time_remaining)} seconds before trying again.")
+    time_remaining = check_lockout()
+    if time_remaining:
+        st.error("🔒 Account locked due to too many failed attempts!")
+        st.warning(f"Please wait {math.ceil(time_remaining)} seconds before trying again.")
         
         # Auto refresh when lockout period is over
         if time_remaining <= 0.5:
-            st.session_state.locked_out = False
-            st.experimental_rerun()
+            st.rerun()
     else:
         login_pass = st.text_input("Enter Master Password:", type="password")
         
         if st.button("Login", type="primary"):
             if login_pass == MASTER_PASSWORD:
-                st.session_state.failed_attempts = 0
-                st.session_state.locked_out = False
+                # Failed attempts are not forgiven here; the client bucket refills on its own
                 st.success("✅ Reauthorized successfully!")
                 
                 with st.spinner("Redirecting to Home..."):
                     time.sleep(1)
-                    st.experimental_rerun()
+                    st.rerun()
             else:
                 st.error("❌ Incorrect master password!")
 
 # Display data statistics in sidebar
 st.sidebar.markdown("---")
 st.sidebar.subheader("📊 System Stats")
-st.sidebar.info(f"Stored Items: {len(st.session_state.stored_data)}")
+session_records = get_session_records()
+session_records.touch(current_session_id())
+with phase("load"):
+    stored_count = get_store().count()
+st.sidebar.info(f"Stored Items: {session_records.count(current_session_id()) + stored_count}")
+if CRYPTOGRAPHY_AVAILABLE:
+    key_cache_stats = get_key_cache_stats()
+    st.sidebar.caption(f"Key cache: {key_cache_stats['size']} keys, {key_cache_stats['hits']} hits / {key_cache_stats['misses']} misses")
+
+# Instrumentation: where this rerun's time went, and what this session holds in memory.
+# Render is everything outside the timed phases, up to this point.
+timings = phase_timer.report(rest="render")
+stop_phase_timer()
+rerun_timings = st.session_state.rerun_timings
+rerun_timings.append({name: round(timings.get(name, 0.0) * 1000, 1) for name in TIMED_PHASES + ["total"]})
+del rerun_timings[:-RERUN_HISTORY]
+with st.sidebar.expander("⏱️ Performance"):
+    latest = rerun_timings[-1]
+    st.caption(" · ".join(f"{name} {latest[name]:.1f} ms" for name in TIMED_PHASES) + f" · total {latest['total']:.1f} ms")
+    st.bar_chart(rerun_timings, y=TIMED_PHASES, height=160)
+    session_id = current_session_id()
+    state_size = approximate_size({key: st.session_state[key] for key in st.session_state})
+    records_size = approximate_size(session_records.session_records(session_id))
+    process_stats = session_records.stats()
+    st.caption(f"Session memory: {state_size / 1024:.1f} KB state + {records_size / 1024:.1f} KB in {session_records.count(session_id)} unsaved records")
+    st.caption(f"Process: {process_stats['records']} unsaved records shared across {process_stats['sessions']} sessions")
 
 # Add footer
 st.sidebar.markdown("---")